@@ -0,0 +1,74 @@
+"""Compares the matchers compiled with the regex module and with the re module of the standard library
+
+Run from the root of the repository: python -m benchmarks.bench_backends
+"""
+import subprocess
+import sys
+import time
+
+from regexutils import backends, regexes
+
+TEXT = "Quedamos el lunes 4 de noviembre de 2019 con Pangeanic S.A. (h.degroote@pangeanic.com, @Hañz_í), " \
+       "con DNI 50.083.695-E y CIF B97017461. ¿Ésto es #PaNíwrevña_2? Sólo aquél lo sabe: 12345678Z.\n" \
+       "El presente documento es confidencial y va dirigido exclusivamente a su destinatario.\n"
+NR_REPEATS = 2000
+MATCHERS = [
+    regexes.CIFMatcher,
+    regexes.DNIMatcher,
+    regexes.EmailMatcher,
+    regexes.DateMatcher,
+    regexes.CompanyExtensionMatcher,
+    regexes.HashTagMatcher,
+    regexes.SpanishDemonstrativePronounsMatcher,
+    regexes.MentionMatcher,
+]
+
+
+def import_time(module):
+    """Returns the time it takes a fresh interpreter to import module"""
+    code = "import time; start = time.perf_counter(); import {}; print(time.perf_counter() - start)".format(module)
+    return float(subprocess.check_output([sys.executable, "-c", code]))
+
+
+def build_time(backend):
+    """Returns the time it takes a fresh interpreter to import the matchers and build them with backend (the import of
+    the regex module or the translation of the regexes for re included)"""
+    code = "import time; start = time.perf_counter(); from regexutils import regexes\n" \
+           "for matcher_class in [{}]: matcher_class(backend={!r})\n" \
+           "print(time.perf_counter() - start)".format(
+               ", ".join("regexes." + matcher_class.__name__ for matcher_class in MATCHERS), backend)
+    return min(float(subprocess.check_output([sys.executable, "-W", "ignore", "-c", code])) for i in range(3))
+
+
+def best_time(func, repeats=3):
+    best = None
+    for i in range(repeats):
+        start = time.perf_counter()
+        res = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return res, best
+
+
+def main():
+    print("import regex {:.3f}s   import re {:.3f}s".format(import_time("regex"), import_time("re")))
+    print("building all matchers in a new process: regex {:.3f}s   re {:.3f}s".format(
+        build_time(backends.REGEX), build_time(backends.RE)))
+
+    text = TEXT * NR_REPEATS
+    for matcher_class in MATCHERS:
+        timings = {}
+        results = {}
+        for backend in [backends.REGEX, backends.RE]:
+            matcher = matcher_class(backend=backend)
+            results[backend], timings[backend] = best_time(lambda: [elem.span() for elem in matcher.match(text)])
+        assert results[backends.RE] == results[backends.REGEX]
+        fastest = backends.fastest_backend(matcher_class().matcher_regex.pattern,
+                                           matcher_class().matcher_regex.flags)
+        print("{:<36} regex {:.3f}s   re {:.3f}s   ({} matches, fastest on the sample: {})".format(
+            matcher_class.__name__, timings[backends.REGEX], timings[backends.RE], len(results[backends.RE]),
+            fastest))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compares the date regex built with capturing groups (the builders' default) with the capture-free version used by
+DateMatcher: matching time and size of the match objects
+
+Run from the root of the repository: python -m benchmarks.bench_builders
+"""
+import time
+import tracemalloc
+
+from regex import regex
+from regexutils.regexes import DateMatcher, MultiWordRegexBuilder, SingleWordRegexBuilder
+
+SEGMENT = "Quedamos el lunes 4 de noviembre de 2019 a las 4 en plaza de la virgen, o el veintiséis de marzo 2020. " \
+          "Nos vemos los 3 en deciembre algun día a las 4. "
+NR_SEGMENTS = 5000
+
+
+def build_capturing_date_regex(written_numbers, months):
+    """The date regex as it was built before the capture-free mode existed"""
+    b = MultiWordRegexBuilder()
+    wb1 = SingleWordRegexBuilder()
+    wb1.add_list_options_as_regex(written_numbers)
+    wb1.add_option(r"(([1-9])|(1[0-9])|(2[0-9])|(3[0-1]))")
+    b.add_regex_word(wb1.build_as_part())
+    b.add_regex_word("(de)", optional=True)
+    wb3 = SingleWordRegexBuilder()
+    wb3.add_list_options_as_regex(months)
+    b.add_regex_word(wb3.build_as_part())
+    b.add_regex_word("(de)", optional=True)
+    b.add_regex_word(r"((19[0-9][0-9])|(20[0-9][0-9]))")
+    return regex.compile(b.build(), flags=regex.IGNORECASE)
+
+
+def main():
+    text = SEGMENT * NR_SEGMENTS
+    capture_free = DateMatcher().matcher_regex
+    capturing = build_capturing_date_regex(DateMatcher.read_numbers_file(), DateMatcher.read_months_file())
+    for name, pattern in [("capturing", capturing), ("capture-free", capture_free)]:
+        start = time.perf_counter()
+        for i in range(5):
+            matches = list(pattern.finditer(text))
+        elapsed = (time.perf_counter() - start) / 5
+        del matches
+        tracemalloc.start()
+        matches = list(pattern.finditer(text))
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print("{:<13} {:2} groups   {:.3f}s for {} matches   {} bytes allocated per match".format(
+            name, pattern.groups, elapsed, len(matches), size // len(matches)))
+    assert [m.span() for m in capturing.finditer(text)] == [m.span() for m in capture_free.finditer(text)]
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Compares matching a repetitive corpus (like a translation memory) with and without a ResultCache
+
+Run from the root of the repository: python -m benchmarks.bench_cache
+"""
+import random
+import time
+
+from regexutils import regexes
+from regexutils.cache import ResultCache, CachedMatcher
+
+BOILERPLATE = [
+    "Pangeanic S.A. se reserva el derecho de modificar estas condiciones sin previo aviso.",
+    "Para más información escriba a info@pangeanic.com o síganos en @Pangeanic.",
+    "Firmado en Valencia, el 4 de noviembre de 2019.",
+    "Todos los derechos reservados.",
+    "El presente documento es confidencial y va dirigido exclusivamente a su destinatario.",
+]
+NR_SEGMENTS = 50000
+
+
+def make_corpus(duplication_rate, seed=1):
+    """Returns a corpus in which duplication_rate of the segments is a repetition of a segment seen before"""
+    rand = random.Random(seed)
+    segments = []
+    for i in range(NR_SEGMENTS):
+        if segments and rand.random() < duplication_rate:
+            segments.append(rand.choice(BOILERPLATE) if rand.random() < 0.5 else rand.choice(segments))
+        else:
+            segments.append("Segmento {} con el DNI {:08d}Z del cliente nr {} (#ref{}).".format(
+                i, rand.randrange(10 ** 8), rand.randrange(10 ** 6), i))
+    return segments
+
+
+def run(matchers, corpus):
+    start = time.perf_counter()
+    for segment in corpus:
+        for matcher in matchers:
+            matcher.match(segment)
+    return time.perf_counter() - start
+
+
+def main():
+    matchers = [regexes.EmailMatcher(), regexes.DNIMatcher(), regexes.DateMatcher(), regexes.MentionMatcher(),
+                regexes.HashTagMatcher(), regexes.CompanyExtensionMatcher()]
+    for duplication_rate in [0.0, 0.5, 0.8, 0.95]:
+        corpus = make_corpus(duplication_rate)
+        cache = ResultCache()
+        cached_matchers = [CachedMatcher(matcher, cache) for matcher in matchers]
+        plain_time = run(matchers, corpus)
+        cached_time = run(cached_matchers, corpus)
+        stats = cache.stats()
+        print("duplication {:4.0%}: plain {:.3f}s, cached {:.3f}s (x{:.1f}), hit rate {:.1%}, {} entries, {} kB".format(
+            duplication_rate, plain_time, cached_time, plain_time / cached_time,
+            stats.hits / (stats.hits + stats.misses), stats.entries, stats.size_bytes // 1024))
+
+
+if __name__ == '__main__':
+    main()
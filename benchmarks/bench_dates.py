@@ -0,0 +1,59 @@
+"""Compares DateMatcher.parse, which converts the dates from the named groups of a single scan, with finding the dates
+first and parsing each of them with a second regex
+
+Run from the root of the repository: python -m benchmarks.bench_dates
+"""
+import datetime
+import re
+import time
+
+from regexutils import regexes
+
+SEGMENTS = [
+    "En Valencia, a veintiuno de marzo de 2019, reunidos de una parte D. Juan, con DNI 50.083.695-E, ",
+    "y de otra parte la sociedad Pangeanic S.L., constituida el 4 de noviembre de 1998 ante notario, ",
+    "con efectos desde el treinta y uno de diciembre de 2019 hasta el 15 de Enero de 2021, ",
+    "sin perjuicio de lo dispuesto en la cláusula tercera del contrato de arrendamiento. ",
+]
+NR_REPEATS = 20000
+# Second pass: splits a date found by the DateMatcher into its words
+SECOND_PASS = re.compile(r"(\w+(?:\s+y\s+uno)?)[\W_]+(?:de[\W_]+)?(\w+)[\W_]+(?:de[\W_]+)?(\d{4})", flags=re.IGNORECASE)
+
+
+def two_pass(matcher, text):
+    res = []
+    for elem in matcher.match(text):
+        day, month, year = SECOND_PASS.fullmatch(elem.group()).groups()
+        day = int(day) if day.isdigit() else matcher.day_values[" ".join(day.split()).casefold()]
+        try:
+            res.append((elem.span(), datetime.date(int(year), matcher.month_values[month.casefold()], day)))
+        except ValueError:
+            pass
+    return res
+
+
+def best_time(func, repeats=3):
+    best = None
+    for i in range(repeats):
+        start = time.perf_counter()
+        res = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return res, best
+
+
+def main():
+    text = "".join(SEGMENTS) * NR_REPEATS
+    for backend in ["regex", "re"]:
+        matcher = regexes.DateMatcher(backend=backend)
+        matches, scan_time = best_time(lambda: matcher.match(text))
+        expected, two_pass_time = best_time(lambda: two_pass(matcher, text))
+        res, parse_time = best_time(lambda: matcher.parse(text))
+        assert res == expected
+        print("{:<5} {} dates   scan only {:.3f}s   two passes {:.3f}s ({:.0f} dates/s)   parse {:.3f}s ({:.0f} dates/s)"
+              .format(backend, len(res), scan_time, two_pass_time, len(res) / two_pass_time, parse_time,
+                      len(res) / parse_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Compares the latency of an edit in an IncrementalSession with a full rescan of the edited text
+
+Run from the root of the repository: python -m benchmarks.bench_incremental
+"""
+import time
+
+from regexutils import regexes
+from regexutils.incremental import IncrementalSession
+
+SEGMENT = "Pangea S.A. (h.degroote@pangeanic.com, @Hañz_í, #PaNíwrevña_2) firmó el 4 de noviembre de 2019 " \
+          "con DNI 50.083.695-E y CIF B97017461. "
+NR_EDITS = 200
+
+
+def main():
+    matchers = [regexes.DateMatcher(), regexes.EmailMatcher(), regexes.CompanyExtensionMatcher()]
+    for nr_segments in [10, 1000, 10000]:
+        text = SEGMENT * nr_segments
+        for matcher in matchers:
+            session = IncrementalSession(matcher, text)
+            middle = len(text) // 2
+            start = time.perf_counter()
+            for i in range(NR_EDITS):
+                session.edit(middle + i, 0, "x")
+            edit_time = (time.perf_counter() - start) / NR_EDITS
+
+            start = time.perf_counter()
+            for i in range(5):
+                matcher.match(session.text)
+            full_time = (time.perf_counter() - start) / 5
+            print("{:>8} chars {:<25} edit: {:9.1f}us   full rescan: {:11.1f}us".format(
+                len(text), type(matcher).__name__, edit_time * 1e6, full_time * 1e6))
+
+
+if __name__ == '__main__':
+    main()
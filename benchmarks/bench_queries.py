@@ -0,0 +1,55 @@
+"""Compares filtering a corpus with RegexMatcher.match and with the contains/count queries, and counting the matches
+of a single long text
+
+Run from the root of the repository: python -m benchmarks.bench_queries
+"""
+import time
+import tracemalloc
+
+from regexutils import regexes
+
+SEGMENTS = [
+    "Para más información escriba a info@pangeanic.com o llame al número de siempre. " * 3,
+    "Todos los derechos reservados #legal #aviso #privacidad #cookies",
+    "El presente documento es confidencial y va dirigido exclusivamente a su destinatario. " * 2,
+    "Firmado en Valencia por 50.083.695-E y 12345678Z el 4 de noviembre de 2019 (#firma #contrato)",
+]
+NR_SEGMENTS = 100000
+NR_LONG_TEXT_SEGMENTS = 20000
+
+
+def measure(func, corpus):
+    tracemalloc.start()
+    start = time.perf_counter()
+    res = func(corpus)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return res, elapsed, peak
+
+
+def main():
+    corpus = [SEGMENTS[i % len(SEGMENTS)] for i in range(NR_SEGMENTS)]
+    long_text = " ".join(corpus[:NR_LONG_TEXT_SEGMENTS])
+    matchers = [regexes.EmailMatcher(), regexes.DNIMatcher(), regexes.DateMatcher(), regexes.HashTagMatcher()]
+    for matcher in matchers:
+        name = type(matcher).__name__
+        expected, match_time, match_peak = measure(lambda texts: [len(matcher.match(t)) > 0 for t in texts], corpus)
+        res, query_time, query_peak = measure(matcher.contains_batch, corpus)
+        assert list(res) == expected
+        print("{:<15} contains: match {:.3f}s ({} kB)   contains_batch {:.3f}s ({} kB)".format(
+            name, match_time, match_peak // 1024, query_time, query_peak // 1024))
+        expected, match_time, match_peak = measure(lambda texts: [len(matcher.match(t)) for t in texts], corpus)
+        res, query_time, query_peak = measure(matcher.count_batch, corpus)
+        assert list(res) == expected
+        print("{:<15} count:    match {:.3f}s ({} kB)   count_batch    {:.3f}s ({} kB)".format(
+            name, match_time, match_peak // 1024, query_time, query_peak // 1024))
+        expected, match_time, match_peak = measure(lambda text: len(matcher.match(text)), long_text)
+        res, query_time, query_peak = measure(matcher.count, long_text)
+        assert res == expected
+        print("{:<15} long text: match {:.3f}s ({} kB)   count          {:.3f}s ({} kB)".format(
+            name, match_time, match_peak // 1024, query_time, query_peak // 1024))
+
+
+if __name__ == '__main__':
+    main()
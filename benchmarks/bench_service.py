@@ -0,0 +1,76 @@
+"""Load generator for the matching service: starts a MatchingService behind its HTTP server on localhost and fires
+requests from concurrent keep-alive clients, reporting throughput and p50/p99 latencies
+
+Run from the root of the repository: python -m benchmarks.bench_service
+"""
+import asyncio
+import random
+import time
+
+from regexutils import regexes
+from regexutils.service import MatchingService, start_server
+
+MATCHERS = {"email": regexes.EmailMatcher, "date": regexes.DateMatcher, "dni": regexes.DNIMatcher}
+SEGMENT = "Pangea S.A. (h.degroote@pangeanic.com) firmó el 4 de noviembre de 2019 con DNI 50.083.695-E. "
+NR_CLIENTS = 64
+REQUESTS_PER_CLIENT = 50
+
+
+async def client(port, rand, latencies, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for i in range(REQUESTS_PER_CLIENT):
+        # Mostly short segments, sometimes a whole document
+        text = SEGMENT * (rand.randrange(1, 4) if rand.random() < 0.95 else rand.randrange(200, 400))
+        data = text.encode("utf-8")
+        start = time.perf_counter()
+        connection = "close" if i == REQUESTS_PER_CLIENT - 1 else "keep-alive"
+        writer.write("POST /match/{} HTTP/1.1\r\nContent-Length: {}\r\nConnection: {}\r\n\r\n".format(
+            rand.choice(list(MATCHERS)), len(data), connection).encode("latin-1") + data)
+        status_line = await reader.readline()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b"\r\n":
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - start)
+        status = int(status_line.split()[1])
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == 503:
+            await asyncio.sleep(0.01)
+    await reader.read()
+    writer.close()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run(use_processes):
+    async with MatchingService(MATCHERS, max_workers=4, use_processes=use_processes, max_pending=128) as service:
+        server = await start_server(service)
+        port = server.sockets[0].getsockname()[1]
+        # Start up the workers before measuring
+        await asyncio.gather(*[service.amatch(name, SEGMENT * 100) for name in MATCHERS for i in range(4)])
+        latencies = []
+        statuses = {}
+        start = time.perf_counter()
+        await asyncio.gather(*[client(port, random.Random(i), latencies, statuses) for i in range(NR_CLIENTS)])
+        total_time = time.perf_counter() - start
+        server.close()
+        await server.wait_closed()
+    print("{:<9} {:6.0f} requests/s   p50 {:6.1f}ms   p99 {:6.1f}ms   statuses {}".format(
+        "processes" if use_processes else "threads", len(latencies) / total_time,
+        percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000, statuses))
+
+
+def main():
+    asyncio.run(run(use_processes=False))
+    asyncio.run(run(use_processes=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,560 @@
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+import re
+import sys
+import time
+import warnings
+
+REGEX = "regex"  # Always use the regex module
+RE = "re"  # Always use the re module (raises UnsupportedPattern if the regex cannot be translated)
+AUTO = "auto"  # Use re if the regex can be translated, the regex module otherwise
+FASTEST = "fastest"  # Use the engine which matches the regex fastest on a sample text
+
+# Backend used when none is specified. The regex module is the default, as it returns richer match objects
+# (e.g. with a captures method)
+DEFAULT_BACKEND = REGEX
+
+SAMPLE_TEXT = "Quedamos el lunes 4 de noviembre de 2019 con Pangeanic S.A. (h.degroote@pangeanic.com, @Hañz_í), " \
+              "con DNI 50.083.695-E y CIF B97017461. ¿Ésto es #PaNíwrevña_2? Sólo aquél lo sabe: 12345678Z. " * 20
+
+class UnsupportedPattern(ValueError):
+    """Raised when a regex cannot be compiled by the re module with the same meaning as by the regex module"""
+
+
+def compile_regex(pattern, flags=0, backend=None):
+    """Compiles pattern (written for the regex module) with the given backend (DEFAULT_BACKEND if not specified)
+    The re module of the standard library is often faster than the regex module for simple regexes, and it is
+    imported anyway. For re, the pattern is translated (see translate_to_re) so that it finds the same matches as with
+    the regex module. Only the match objects differ: those of re lack methods like captures, so code which needs these
+    must use the REGEX backend, as AUTO and FASTEST can return either kind
+    The flags of the re and the regex module have the same values, so either can be used"""
+    if backend is None:
+        backend = DEFAULT_BACKEND
+    if backend == REGEX:
+        return _regex_module().compile(pattern, flags=flags)
+    if backend == RE:
+        return re.compile(translate_to_re(pattern, flags), flags=flags)
+    if backend == AUTO:
+        try:
+            return compile_regex(pattern, flags, RE)
+        except UnsupportedPattern:
+            return compile_regex(pattern, flags, REGEX)
+    if backend == FASTEST:
+        return compile_regex(pattern, flags, fastest_backend(pattern, flags))
+    raise ValueError("Unknown backend: " + str(backend))
+
+
+@lru_cache(maxsize=None)
+def fastest_backend(pattern, flags=0):
+    """Returns the backend which finds all matches of pattern in SAMPLE_TEXT fastest"""
+    try:
+        candidates = {RE: compile_regex(pattern, flags, RE)}
+    except UnsupportedPattern:
+        return REGEX
+    candidates[REGEX] = compile_regex(pattern, flags, REGEX)
+    timings = {}
+    for backend, compiled in candidates.items():
+        best = None
+        for i in range(3):
+            start = time.perf_counter()
+            for elem in compiled.finditer(SAMPLE_TEXT):
+                pass
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[backend] = best
+    return min(timings, key=timings.get)
+
+
+def _regex_module():
+    """Imports the regex module only when it is used"""
+    from regex import regex
+    return regex
+
+
+_QUANTIFIER = re.compile(r"\{\d*(,\d*)?\}")
+_PROPERTY = re.compile(r"\{\^?([A-Za-z]{1,2})\}|([A-Za-z])")
+_HEX_ESCAPE_LENGTHS = {"x": 2, "u": 4, "U": 8}
+_CONTROL_ESCAPES = {"a": 0x07, "f": 0x0C, "n": 0x0A, "r": 0x0D, "t": 0x09, "v": 0x0B}
+# Flags with the same meaning in both modules
+_SUPPORTED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.UNICODE
+# Matches any character outside the Basic Multilingual Plane
+_SUPPLEMENTARY = "[\\U00010000-\\U0010ffff]"
+
+
+@lru_cache(maxsize=None)
+def translate_to_re(pattern, flags=0):
+    """Translates a pattern written for the regex module into a pattern for the re module which finds the same matches
+    The character classes whose meaning differs between the modules are replaced by explicit character classes with
+    the meaning of the regex module: Unicode general categories (like \\p{P}, \\p{Lu} or \\P{L}), \\w, \\s, \\d and
+    the word boundaries \\b and \\B. If flags contains IGNORECASE, the characters which re does not consider
+    equivalent to the same characters as the regex module (e.g. re matches "i" with "ı") are replaced by explicit sets
+    of the characters the regex module matches them with, in which case is not ignored. So are all character classes
+    Raises UnsupportedPattern if the pattern uses features re does not have (or which it interprets differently), or
+    if it needs the tables of regexutils.unicodetables and these were generated with another version of the installed
+    regex module"""
+    if flags & ~_SUPPORTED_FLAGS:
+        raise UnsupportedPattern("Unsupported flags: " + str(flags & ~_SUPPORTED_FLAGS))
+    ignore_case = bool(flags & re.IGNORECASE)
+    res = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            if i + 1 >= len(pattern):
+                raise UnsupportedPattern("Pattern ends with a backslash")
+            escaped = pattern[i + 1]
+            if escaped in "pP":
+                prop = _PROPERTY.match(pattern, i + 2)
+                if prop is None:
+                    raise UnsupportedPattern("Unsupported property at position " + str(i))
+                res.append(_class_regex(pattern[i:prop.end()], ignore_case))
+                i = prop.end()
+            elif escaped in "wWsSdD":
+                res.append(_class_regex(pattern[i:i + 2], ignore_case))
+                i += 2
+            elif escaped in "bB":
+                res.append(_word_boundary_regex(escaped == "B", ignore_case))
+                i += 2
+            elif escaped in "AZ":
+                res.append(pattern[i:i + 2])
+                i += 2
+            elif escaped in "123456789":
+                if ignore_case:
+                    raise UnsupportedPattern("Backreferences are not supported when ignoring case")
+                res.append(pattern[i:i + 2])
+                i += 2
+            else:
+                code_point, i = _parse_char_escape(pattern, i)
+                res.append(_literal_regex(code_point, ignore_case))
+        elif char == "[":
+            end = _set_end(pattern, i)
+            res.append(_class_regex(pattern[i:end], ignore_case))
+            i = end
+        elif char == "(":
+            end = _group_opening_end(pattern, i, ignore_case)
+            res.append(pattern[i:end])
+            i = end
+        elif char == "{":
+            quantifier = _QUANTIFIER.match(pattern, i)
+            if quantifier is None:
+                raise UnsupportedPattern("Fuzzy matching and literal braces are not supported")
+            res.append(quantifier.group(0))
+            i = quantifier.end()
+        elif char in ".^$|)*+?":
+            res.append(char)
+            i += 1
+        else:
+            res.append(_literal_regex(ord(char), ignore_case))
+            i += 1
+    translated = "".join(res)
+    try:
+        # Compiled with the flags compile_regex uses, so that the compiled regex is cached by re
+        re.compile(translated, flags=flags)
+    except re.error as e:
+        raise UnsupportedPattern(str(e))
+    return translated
+
+
+@lru_cache(maxsize=None)
+def _class_regex(class_pattern, ignore_case):
+    """Translates a character set or class escape (the same sets are used many times in the regexes of a builder)"""
+    if class_pattern.startswith("["):
+        ranges, end = _parse_set(class_pattern, 0, ignore_case)
+    else:
+        ranges, end = _parse_class_escape(class_pattern, 0, ignore_case)
+    if end != len(class_pattern):
+        raise UnsupportedPattern("Unsupported character class: " + class_pattern)
+    return _case_sensitive(_set_regex(ranges), ignore_case)
+
+
+def _case_sensitive(set_regex, ignore_case):
+    """Makes a regex match case-sensitively in a pattern compiled with IGNORECASE (it already includes the characters
+    the regex module considers equivalent)"""
+    return "(?-i:" + set_regex + ")" if ignore_case else set_regex
+
+
+def _set_end(pattern, i):
+    """Returns the position after the end of the character set starting at position i of pattern (the position after
+    the pattern if the set is not terminated)"""
+    j = i + 1
+    if pattern.startswith("^", j):
+        j += 1
+    if pattern.startswith("]", j):
+        j += 1
+    while j < len(pattern):
+        if pattern[j] == "\\":
+            j += 2
+        elif pattern[j] == "]":
+            return j + 1
+        else:
+            j += 1
+    return len(pattern)
+
+
+def _group_opening_end(pattern, i, ignore_case):
+    """Returns the end of the opening of the group starting at position i of pattern (or of the whole group for
+    comments and named backreferences)"""
+    if not pattern.startswith("?", i + 1):
+        return i + 1
+    for opening in ["(?:", "(?=", "(?!", "(?<=", "(?<!"]:
+        if pattern.startswith(opening, i):
+            return i + len(opening)
+    if pattern.startswith("(?P<", i):
+        end = pattern.find(">", i)
+    elif pattern.startswith("(?#", i):
+        end = pattern.find(")", i)
+    elif pattern.startswith("(?P=", i) and not ignore_case:
+        end = pattern.find(")", i)
+    else:
+        raise UnsupportedPattern("Unsupported group at position " + str(i))
+    if end == -1:
+        raise UnsupportedPattern("Unterminated group at position " + str(i))
+    return end + 1
+
+
+def _parse_class_escape(pattern, i, ignore_case):
+    """Parses the class escape (like \\p{Lu} or \\w) at position i of pattern, and returns the ranges of the code points
+    it matches and the position after it"""
+    escaped = pattern[i + 1]
+    if escaped in "pP":
+        prop = _PROPERTY.match(pattern, i + 2)
+        if prop is None:
+            raise UnsupportedPattern("Unsupported property at position " + str(i))
+        category = prop.group(1) or prop.group(2)
+        negated = (escaped == "P") != prop.group(0).startswith("{^")
+        ranges = _category_ranges(category)
+        if ignore_case and _has_case_equivalents(ranges):
+            # The regex module does not simply add the case-insensitive equivalents of the characters of a category
+            # (e.g. \p{Lu} matches all cased letters)
+            raise UnsupportedPattern("Categories with cased characters are not supported when ignoring case")
+        end = prop.end()
+    else:
+        negated = escaped.isupper()
+        ranges = _unicode_tables()[0][escaped.lower()]
+        end = i + 2
+    if ignore_case:
+        ranges = _case_closure(ranges)
+    if negated:
+        ranges = _complement(ranges)
+    return ranges, end
+
+
+def _parse_char_escape(pattern, i):
+    """Parses the escape of a single character at position i of pattern, and returns its code point and the position
+    after it"""
+    escaped = pattern[i + 1]
+    if escaped in _HEX_ESCAPE_LENGTHS:
+        end = i + 2 + _HEX_ESCAPE_LENGTHS[escaped]
+        digits = pattern[i + 2:end]
+        if len(digits) != _HEX_ESCAPE_LENGTHS[escaped] or not all(digit in "0123456789abcdefABCDEF" for digit in digits):
+            raise UnsupportedPattern("Invalid escape at position " + str(i))
+        return int(digits, 16), end
+    if escaped in _CONTROL_ESCAPES:
+        return _CONTROL_ESCAPES[escaped], i + 2
+    if escaped.isalnum():
+        raise UnsupportedPattern("Unsupported escape \\" + escaped)
+    return ord(escaped), i + 2
+
+
+def _parse_set(pattern, i, ignore_case):
+    """Parses the character set starting at position i of pattern, and returns the ranges of the code points it matches
+    and the position after it"""
+    j = i + 1
+    negated = pattern.startswith("^", j)
+    if negated:
+        j += 1
+    ranges = []
+    first = True
+    while j < len(pattern):
+        char = pattern[j]
+        if char == "]" and not first:
+            # A "]" directly after the opening of a set (or its negation) is a literal
+            if ignore_case:
+                ranges = _case_closure(ranges)
+            if negated:
+                ranges = _complement(ranges)
+            return _normalise_ranges(ranges), j + 1
+        first = False
+        if char == "[":
+            raise UnsupportedPattern("Nested sets and POSIX classes are not supported by re")
+        if char == "\\" and pattern.startswith(tuple("pPwWsSdD"), j + 1):
+            class_ranges, j = _parse_class_escape(pattern, j, ignore_case)
+            ranges.extend(class_ranges)
+            continue
+        start, j = _parse_set_char(pattern, j)
+        end = start
+        if pattern.startswith("-", j) and j + 1 < len(pattern) and pattern[j + 1] != "]":
+            end, j = _parse_set_char(pattern, j + 1)
+            if end < start:
+                raise UnsupportedPattern("Invalid range at position " + str(j))
+        ranges.append([start, end])
+    raise UnsupportedPattern("Unterminated character set at position " + str(i))
+
+
+def _parse_set_char(pattern, j):
+    """Parses a single character of a set at position j of pattern, and returns its code point and the position
+    after it"""
+    if pattern[j] != "\\":
+        return ord(pattern[j]), j + 1
+    if j + 1 >= len(pattern):
+        raise UnsupportedPattern("Pattern ends with a backslash")
+    if pattern[j + 1] == "b":
+        return 0x08, j + 2  # Backspace
+    return _parse_char_escape(pattern, j)
+
+
+@lru_cache(maxsize=None)
+def _literal_regex(code_point, ignore_case):
+    """Returns a regex matching a single character (and its case-insensitive equivalents if ignore_case is True)"""
+    if ignore_case:
+        equivalents = _unicode_tables()[1].get(code_point, (code_point,))
+        if sorted(equivalents) != _re_case_equivalents(code_point):
+            return _case_sensitive(_set_regex(_normalise_ranges([[elem, elem] for elem in equivalents])), True)
+    return re.escape(chr(code_point))
+
+
+def _re_case_equivalents(code_point):
+    """Returns the sorted code points which re matches with code_point when ignoring case"""
+    return [ord(elem) for elem in re.findall(re.escape(chr(code_point)), _case_text(), flags=re.IGNORECASE)]
+
+
+@lru_cache(maxsize=None)
+def _case_text():
+    """Returns a string with all characters which have case-insensitive equivalents, in order"""
+    code_points = set(_case_code_points())
+    for equivalents in _unicode_tables()[1].values():
+        code_points.update(equivalents)
+    return "".join(map(chr, sorted(code_points)))
+
+
+@lru_cache(maxsize=None)
+def _word_boundary_regex(negated, ignore_case):
+    """Returns a regex matching a word boundary (\\b) of the regex module, or a position which is not one (\\B)"""
+    word_char = _case_sensitive(_set_regex(_unicode_tables()[0]["w"]), ignore_case)
+    if negated:
+        return "(?:(?<=" + word_char + ")(?=" + word_char + ")|(?<!" + word_char + ")(?!" + word_char + "))"
+    return "(?:(?<=" + word_char + ")(?!" + word_char + ")|(?<!" + word_char + ")(?=" + word_char + "))"
+
+
+def _set_regex(ranges):
+    """Returns a regex matching the characters in the sorted, non-overlapping ranges
+    re checks the ranges outside the Basic Multilingual Plane one by one, for every character it tries to match. These
+    are therefore put in a separate alternative, which is only tried for characters outside the plane"""
+    if not ranges:
+        return "(?!)"
+    bmp_ranges, supplementary_ranges = _split_ranges(ranges)
+    bmp_set = _bmp_set_regex(bmp_ranges) if bmp_ranges else ""
+    if not supplementary_ranges:
+        return bmp_set
+    if supplementary_ranges == [[0x10000, sys.maxunicode]]:
+        supplementary = _SUPPLEMENTARY
+    else:
+        supplementary = "(?=" + _SUPPLEMENTARY + ")[" + _ranges_content(supplementary_ranges) + "]"
+    if not bmp_set:
+        return "(?:" + supplementary + ")"
+    return "(?:" + bmp_set + "|" + supplementary + ")"
+
+
+def _bmp_set_regex(bmp_ranges):
+    """Returns a set matching the characters in ranges inside the Basic Multilingual Plane
+    Compiling a set takes re time proportional to its number of characters, so sets with more than half of the
+    characters of the plane are written as the negation of the others"""
+    if sum(end - start + 1 for start, end in bmp_ranges) <= 0x8000:
+        return "[" + _ranges_content(bmp_ranges) + "]"
+    others = [elem for elem in _complement(bmp_ranges) if elem[0] <= 0xFFFF]
+    others[-1:] = _split_ranges(others[-1:])[0]
+    return "[^" + _ranges_content(others) + _SUPPLEMENTARY[1:-1] + "]"
+
+
+def category_class_content(category, negated=False):
+    """Returns the content of a character class (without the brackets) matching all characters of a Unicode general
+    category (e.g. "P" or "Po"), or all characters not in it if negated is True"""
+    ranges = _category_ranges(category)
+    return _ranges_content(_complement(ranges) if negated else ranges)
+
+
+def _category_ranges(category):
+    """Returns the sorted [start, end] ranges of the code points in a Unicode general category"""
+    category_ranges = _unicode_tables()[0]
+    if len(category) == 2 and category in _ALL_CATEGORIES:
+        return category_ranges[category]
+    if len(category) == 1 and any(name.startswith(category) for name in _ALL_CATEGORIES):
+        return _normalise_ranges([elem for name in _ALL_CATEGORIES if name.startswith(category)
+                                  for elem in category_ranges[name]])
+    raise UnsupportedPattern("Unknown general category: " + category)
+
+
+def _case_closure(ranges):
+    """Adds the case-insensitive equivalents of the characters in ranges"""
+    case_equivalents = _unicode_tables()[1]
+    code_points = _case_code_points()
+    res = list(ranges)
+    for start, end in ranges:
+        for code_point in code_points[bisect_left(code_points, start):bisect_right(code_points, end)]:
+            res.extend([elem, elem] for elem in case_equivalents[code_point])
+    return _normalise_ranges(res)
+
+
+def _has_case_equivalents(ranges):
+    code_points = _case_code_points()
+    return any(bisect_left(code_points, start) != bisect_right(code_points, end) for start, end in ranges)
+
+
+@lru_cache(maxsize=None)
+def _case_code_points():
+    """Returns the sorted list of the code points which have case-insensitive equivalents"""
+    return sorted(_unicode_tables()[1])
+
+
+def _complement(ranges):
+    complement = []
+    previous_end = -1
+    for start, end in _normalise_ranges(ranges):
+        if start > previous_end + 1:
+            complement.append([previous_end + 1, start - 1])
+        previous_end = end
+    if previous_end < sys.maxunicode:
+        complement.append([previous_end + 1, sys.maxunicode])
+    return complement
+
+
+def _normalise_ranges(ranges):
+    """Sorts ranges and merges those which overlap or touch"""
+    res = []
+    for start, end in sorted(ranges):
+        if res and start <= res[-1][1] + 1:
+            res[-1][1] = max(res[-1][1], end)
+        else:
+            res.append([start, end])
+    return res
+
+
+def _split_ranges(ranges):
+    """Splits sorted ranges into those inside and those outside the Basic Multilingual Plane"""
+    bmp_ranges = []
+    supplementary_ranges = []
+    for start, end in ranges:
+        if end <= 0xFFFF:
+            bmp_ranges.append([start, end])
+        elif start > 0xFFFF:
+            supplementary_ranges.append([start, end])
+        else:
+            bmp_ranges.append([start, 0xFFFF])
+            supplementary_ranges.append([0x10000, end])
+    return bmp_ranges, supplementary_ranges
+
+
+def _ranges_content(ranges):
+    return "".join(_escape_code_point(start) if start == end else
+                   _escape_code_point(start) + "-" + _escape_code_point(end) for start, end in ranges)
+
+
+def _escape_code_point(code_point):
+    """Escapes a code point for use in a character set. Only the characters with a special meaning are escaped, as re
+    parses plain characters much faster than escapes"""
+    char = chr(code_point)
+    if char in _SPECIAL_SET_CHARS:
+        return "\\" + char
+    return char
+
+
+# Characters with a special meaning in a set, or in the set operations which re warns about
+_SPECIAL_SET_CHARS = set("\\]-^[&~|")
+
+
+_ALL_CATEGORIES = {"Lu", "Ll", "Lt", "Lm", "Lo", "Mn", "Mc", "Me", "Nd", "Nl", "No", "Pc", "Pd", "Ps", "Pe", "Pi", "Pf",
+                   "Po", "Sm", "Sc", "Sk", "So", "Zs", "Zl", "Zp", "Cc", "Cf", "Cs", "Co", "Cn"}
+# The classes of the regex module stored in the tables besides the general categories
+_CLASS_ESCAPES = {"w": r"\w", "s": r"\s", "d": r"\d"}
+
+
+@lru_cache(maxsize=None)
+def _unicode_tables():
+    """Loads the tables (see write_unicode_tables), once. Returns a dict which maps the general categories and the
+    names of the class escapes (w, s and d) to their ranges, and a dict which maps code points to the code points the
+    regex module matches them with when ignoring case (if there are any besides itself)
+    Raises UnsupportedPattern if the tables were generated with another version of the installed regex module"""
+    from regexutils import unicodetables
+    if not _tables_match_regex_module(unicodetables.REGEX_VERSION):
+        raise UnsupportedPattern("The Unicode tables were generated with another version of the regex module")
+    class_ranges = {name: [[values[i], values[i + 1]] for i in range(0, len(values), 2)]
+                    for name, values in unicodetables.CLASS_RANGES.items()}
+    return class_ranges, unicodetables.CASE_EQUIVALENTS
+
+
+@lru_cache(maxsize=None)
+def _tables_match_regex_module(tables_version):
+    """Returns whether the tables were generated with the installed version of the regex module (or True if it is not
+    installed), and warns once if not: their Unicode data could differ from that of the installed version"""
+    try:
+        regex = _regex_module()
+    except ImportError:
+        return True
+    if regex.__version__ == tables_version:
+        return True
+    warnings.warn("regexutils.unicodetables was generated with regex {}, but regex {} is installed: patterns using "
+                  "character classes or ignoring case are compiled with the regex module (run make unicode_tables to "
+                  "update the tables)".format(tables_version, regex.__version__))
+    return False
+
+
+def write_unicode_tables(out):
+    """Writes the module unicodetables, with the tables with which translate_to_re reproduces the character classes and
+    the case-insensitive matching of the installed regex module, to the file-like object out
+    Run "make unicode_tables" to update regexutils/unicodetables.py after upgrading the regex module"""
+    regex = _regex_module()
+    all_chars = "".join(map(chr, range(sys.maxunicode + 1)))
+    out.write('"""Character classes and case-insensitive equivalents of the regex module, used by backends.translate_to_re\n'
+              'Generated by backends.write_unicode_tables with regex {}: do not edit"""\n\n'.format(regex.__version__))
+    out.write("# The version of the regex module the tables were generated with (see backends._unicode_tables)\n"
+              'REGEX_VERSION = "{}"\n\n'.format(regex.__version__))
+    out.write("# Flat tuples of the (start, end) code points of the ranges of every class\nCLASS_RANGES = {\n")
+    classes = sorted((category, r"\p{" + category + "}") for category in _ALL_CATEGORIES)
+    for name, class_regex in classes + sorted(_CLASS_ESCAPES.items()):
+        values = []
+        for elem in regex.finditer(class_regex + "+", all_chars):
+            values += [elem.start(), elem.end() - 1]
+        _write_tuple(out, '    "{}": '.format(name), values, ",\n")
+    out.write("}\n\n")
+
+    # Characters with case-insensitive equivalents: start from the case mappings of Python, and add the characters the
+    # regex module matches with these until there are no more
+    candidates = set()
+    for code_point in range(sys.maxunicode + 1):
+        char = chr(code_point)
+        for mapped in [char.lower(), char.upper(), char.casefold(), char.title()]:
+            if mapped != char:
+                candidates.add(code_point)
+                candidates.update(map(ord, mapped))
+    while True:
+        candidates_class = "[" + "".join(regex.escape(chr(code_point)) for code_point in sorted(candidates)) + "]"
+        found = {elem.start() for elem in regex.finditer(candidates_class, all_chars, flags=regex.IGNORECASE)}
+        if found <= candidates:
+            break
+        candidates |= found
+    candidates_text = "".join(chr(code_point) for code_point in sorted(candidates))
+    out.write("# The code points the regex module matches every code point with when ignoring case, the code point itself "
+              "first\nCASE_EQUIVALENTS = {\n")
+    for code_point in sorted(candidates):
+        equivalents = [ord(elem.group()) for elem in
+                       regex.finditer(regex.escape(chr(code_point)), candidates_text, flags=regex.IGNORECASE)]
+        if equivalents != [code_point]:
+            equivalents = [code_point] + [elem for elem in equivalents if elem != code_point]
+            _write_tuple(out, "    0x{:x}: ".format(code_point), equivalents, ",\n")
+    out.write("}\n")
+
+
+def _write_tuple(out, prefix, values, suffix, line_length=120):
+    """Writes a tuple of integers in hexadecimal notation, wrapping the lines"""
+    line = prefix + "("
+    for i, value in enumerate(values):
+        item = "0x{:x}".format(value) + (", " if i + 1 < len(values) or len(values) == 1 else "")
+        if len(line) + len(item.rstrip()) > line_length:
+            out.write(line.rstrip() + "\n")
+            line = "        "
+        line += item
+    out.write(line.rstrip() + ")" + suffix)
+
+
+if __name__ == '__main__':
+    write_unicode_tables(sys.stdout)
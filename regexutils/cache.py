@@ -0,0 +1,116 @@
+from collections import OrderedDict, namedtuple
+import sys
+import threading
+from regexutils.redaction import doc_spans
+
+
+CacheStats = namedtuple("CacheStats", ["hits", "misses", "evictions", "entries", "size_bytes"])
+
+
+def estimate_size(text, result):
+    """Estimates the memory (in bytes) kept alive by caching result, a list of results for text
+    The text itself is part of the key of the entry"""
+    return sys.getsizeof(text) + sys.getsizeof(result) + sum(sys.getsizeof(elem) for elem in result)
+
+
+class ResultCache:
+    """Thread-safe LRU cache for the results of applying something to a text, limited both in number of entries and
+    in (estimated) size in bytes
+    Entries are keyed by the text and a configuration key, which identifies what was applied to the text, so a single
+    cache can be shared by several matchers. Python caches the hash of a string, so looking up the same text object
+    for several matchers only hashes it once. Keeping the text in the key costs little memory, as the Match objects in
+    the results refer to the text anyway"""
+
+    def __init__(self, max_entries=100000, max_bytes=64 * 1024 * 1024, sizeof=estimate_size):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (result, size)
+        self._lock = threading.Lock()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get_or_compute(self, config_key, text, compute):
+        """Returns the cached result for text and config_key, or stores and returns compute(text) if there is none
+        compute is called outside of the lock, so the same text can be computed twice by concurrent threads"""
+        key = (config_key, text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+        result = compute(text)
+        size = self.sizeof(text, result)
+        if size > self.max_bytes:
+            return result
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (result, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._size -= self._entries.popitem(last=False)[1][1]
+                self._evictions += 1
+        return result
+
+    def stats(self):
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._size)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+class CachedMatcher:
+    """Wraps a RegexMatcher, caching its results per text
+    The results are shared between the calls which hit the cache, so they should not be modified"""
+
+    def __init__(self, matcher, cache=None, config_key=None):
+        """If no cache is given, the matcher gets a ResultCache of its own
+        config_key identifies the results of the matcher in a shared cache. By default it is given by the config_key
+        method of the matcher (see RegexMatcher.config_key), so that equally configured matchers share their results.
+        Matchers without such a method are identified by the matcher object itself"""
+        self.matcher = matcher
+        self.cache = cache if cache is not None else ResultCache()
+        if config_key is None:
+            config_key = matcher.config_key() if hasattr(matcher, "config_key") else matcher
+        self.config_key = config_key
+
+    def match(self, text):
+        return self.cache.get_or_compute(self.config_key, text, self.matcher.match)
+
+    def __getattr__(self, name):
+        """Gives access to the attributes of the wrapped matcher (like max_context)"""
+        if name == "matcher":
+            raise AttributeError(name)
+        return getattr(self.matcher, name)
+
+
+class CachedNameFinder:
+    """Finds the full names in a text with a spacy pipeline (see spacyrules.add_name_matching_to_nlp_pipeline),
+    caching the (start, end, label) spans of the names per text"""
+
+    def __init__(self, nlp, cache=None, extension_name="full_names", label="full_name", config_key=None):
+        """config_key identifies the results in a shared cache (see CachedMatcher). By default it contains the pipeline
+        object itself (not its id, which a new pipeline could reuse), so the cache keeps the pipeline alive while it
+        holds its results"""
+        self.nlp = nlp
+        self.cache = cache if cache is not None else ResultCache()
+        self.extension_name = extension_name
+        self.label = label
+        if config_key is None:
+            config_key = (type(self).__name__, nlp, extension_name, label)
+        self.config_key = config_key
+
+    def _find(self, text):
+        return doc_spans(self.nlp(text), self.extension_name, self.label)
+
+    def spans(self, text):
+        """Returns the spans of the full names in text, to be passed as extra_spans to a redaction.Redactor"""
+        return self.cache.get_or_compute(self.config_key, text, self._find)
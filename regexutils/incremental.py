@@ -0,0 +1,102 @@
+from bisect import bisect_left
+import heapq
+from regex import regex
+from regexutils.regexes import RegexMatcher, CombinedMatcher
+
+
+class IncrementalSession:
+    """Keeps the matches of a matcher in a text up to date while the text is being edited
+    After an edit, only the region around the edit is rescanned: the edited text, widened by the context the matcher
+    needs (see RegexMatcher.max_context). The rescan continues past that region until it is back in step with the
+    previous scan, after which the previous matches are reused (shifted by the change in length of the text).
+    The resulting spans are always equal to those of a full rescan of the edited text, as long as the max_context of
+    the matcher is correct and its regex does not match the empty string.
+    Matchers without max_context are fully rescanned after every edit. The matchers combined by a CombinedMatcher are
+    each tracked by a session of their own
+    """
+
+    _WHITE_SPACE_BEFORE = regex.compile(r"\s", flags=regex.REVERSE)
+    _WHITE_SPACE = regex.compile(r"\s")
+
+    def __init__(self, matcher, text, max_context=None):
+        """max_context overrides the max_context of the matcher"""
+        self.text = text
+        if isinstance(matcher, CombinedMatcher):
+            self._sessions = [IncrementalSession(elem, text, max_context) for elem in matcher.matchers]
+            self.spans = self._merge_sessions()
+            return
+        self._sessions = None
+        self.pattern = matcher.matcher_regex
+        self.max_context = max_context if max_context is not None else matcher.max_context
+        self.spans = self._full_scan(text)
+
+    def _merge_sessions(self):
+        """Merges the spans of the sessions of combined matchers in the order of CombinedMatcher.match"""
+        return list(heapq.merge(*[session.spans for session in self._sessions], key=lambda span: span[0]))
+
+    def _full_scan(self, text):
+        return [elem.span() for elem in self.pattern.finditer(text)]
+
+    def edit(self, offset, deleted, inserted):
+        """Replaces the deleted characters starting at offset by the inserted text, and returns the updated list of
+        spans (start, end) of the matches in the new text"""
+        if self._sessions is not None:
+            for session in self._sessions:
+                session.edit(offset, deleted, inserted)
+            self.text = self.text[:offset] + inserted + self.text[offset + deleted:]
+            self.spans = self._merge_sessions()
+            return self.spans
+        old_spans = self.spans
+        text = self.text[:offset] + inserted + self.text[offset + deleted:]
+        self.text = text
+        if self.max_context is None:
+            self.spans = self._full_scan(text)
+            return self.spans
+        delta = len(inserted) - deleted
+
+        # The previous scan is still valid up to the last position at which matching did not look at the edited text
+        pos = self._scan_start(text, offset)
+        i = bisect_left(old_spans, (pos,))
+        if i > 0 and old_spans[i - 1][1] > pos:
+            i -= 1
+            pos = old_spans[i][0]
+        new_spans = old_spans[:i]
+
+        # Rescan until reaching a position past the edit which both scans tried to match
+        sync_pos = min(self._scan_resume(offset + len(inserted)), len(text))
+        while True:
+            match = self.pattern.search(text, pos, self._scan_reach(text, sync_pos))
+            if match is not None and match.start() < sync_pos:
+                new_spans.append(match.span())
+                pos = match.end() if match.end() > match.start() else match.end() + 1
+                sync_pos = max(sync_pos, match.end())
+                continue
+            j = bisect_left(old_spans, (sync_pos - delta,))
+            if j > 0 and old_spans[j - 1][1] > sync_pos - delta:
+                # The previous scan skipped this position, as it was inside a match
+                sync_pos = old_spans[j - 1][1] + delta
+                continue
+            break
+        new_spans.extend((start + delta, end + delta) for start, end in old_spans[j:])
+        self.spans = new_spans
+        return new_spans
+
+    def _scan_start(self, text, offset):
+        """Returns a position such that matching at any position before it does not look at text from offset on"""
+        if self.max_context == RegexMatcher.WITHIN_TOKEN:
+            white_space = self._WHITE_SPACE_BEFORE.search(text, 0, offset)
+            return white_space.end() if white_space is not None else 0
+        return max(0, offset - self.max_context)
+
+    def _scan_resume(self, edit_end):
+        """Returns a position such that matching at any position from it on does not look at text before edit_end"""
+        if self.max_context == RegexMatcher.WITHIN_TOKEN:
+            return edit_end + 1
+        return edit_end + self.max_context
+
+    def _scan_reach(self, text, pos):
+        """Returns a position such that matching at any position before pos does not look at text from it on"""
+        if self.max_context == RegexMatcher.WITHIN_TOKEN:
+            white_space = self._WHITE_SPACE.search(text, pos)
+            return white_space.end() if white_space is not None else len(text)
+        return min(pos + self.max_context, len(text))
@@ -0,0 +1,141 @@
+from array import array
+from functools import lru_cache
+import unicodedata
+from regex import regex
+import unidecode  # GPL license
+
+# The default word separators of the regex builders (see regexes.default_separators)
+_SEPARATOR = regex.compile(r"[\p{P}\s]")
+# Replaces the characters unidecode erases (like emojis), which must not disappear between two words
+PLACEHOLDER = "\ufffd"
+
+
+@lru_cache(maxsize=None)
+def normalise_char(char):
+    """Returns the casefolded, accent-stripped (mostly ascii) version of a single character
+    The result can be empty (combining accents and format characters like the soft hyphen) or longer than one
+    character (e.g. "ß" becomes "ss").
+    Normalising never changes which characters are word separators: punctuation and white space characters stay a
+    single separator (themselves if unidecode would turn them into something else, e.g. "«" into "<<"), the padding
+    spaces unidecode adds (e.g. "中" becomes "Zhong ") are dropped, and other characters which unidecode erases or
+    turns into separators (e.g. "😀" or "½") become PLACEHOLDER"""
+    converted = unidecode.unidecode(char).casefold()
+    if _SEPARATOR.fullmatch(char):
+        return converted if len(converted) == 1 and _SEPARATOR.fullmatch(converted) else char
+    converted = converted.strip(" ")
+    if _SEPARATOR.search(converted):
+        return PLACEHOLDER
+    if not converted and unicodedata.category(char) not in ("Mn", "Me", "Cf"):
+        return PLACEHOLDER
+    return converted
+
+
+class NormalisedText:
+    """A casefolded, accent-stripped view of a text which remembers where every character came from
+    The normalised text is built in a single pass over the original text. Because unidecode can change the length
+    of the text (a character can disappear or become several characters), an offset map is kept which links every
+    character of the normalised text to the character of the original text it was produced from.
+    The map is stored in an array of machine integers, and is not stored at all when normalising did not change the
+    length of any character (which is always the case for ascii texts)
+    """
+
+    def __init__(self, text):
+        self.original = text
+        self.text, self._offsets = self._normalise(text)
+
+    @staticmethod
+    def _normalise(text):
+        """Returns the normalised text and the offset map (None if the offsets are the same in both texts)"""
+        if text.isascii():
+            return text.lower(), None
+        pieces = list(map(normalise_char, text))
+        lengths = list(map(len, pieces))
+        normalised = "".join(pieces)
+        if len(normalised) == len(text) and min(lengths) == 1:
+            return normalised, None
+        offsets = array("I" if array("I").itemsize >= 4 else "L")
+        for i, length in enumerate(lengths):
+            if length == 1:
+                offsets.append(i)
+            elif length > 1:
+                offsets.extend([i] * length)
+        return normalised, offsets
+
+    def original_index(self, index):
+        """Returns the index in the original text of the character at position index of the normalised text
+        An index at the end of the normalised text is mapped to the end of the original text"""
+        if self._offsets is None:
+            return index
+        if index >= len(self._offsets):
+            return len(self.original)
+        return self._offsets[index]
+
+    def original_span(self, start, end):
+        """Maps a span (start, end) of the normalised text to the corresponding span of the original text
+        If the span starts or ends halfway the expansion of a single original character (e.g. the "s" of the "ss"
+        a "ß" was normalised to), the whole original character is included in the span.
+        Combining characters (which disappear when normalised) directly following the span are included as well"""
+        if self._offsets is None:
+            return start, end
+        orig_start = self.original_index(start)
+        if end <= start:
+            return orig_start, orig_start
+        orig_end = self._offsets[end - 1] + 1
+        while orig_end < len(self.original) and unicodedata.combining(self.original[orig_end]):
+            orig_end += 1
+        return orig_start, orig_end
+
+    def __len__(self):
+        return len(self.text)
+
+    def __str__(self):
+        return self.text
+
+
+class NormalisedMatch:
+    """A match found in the normalised view of a text, reported in terms of the original text
+    Mimics the most used methods of a regex match object (span, start, end and group).
+    The match in the normalised text is still available as the match attribute"""
+    __slots__ = ("match", "string", "_span")
+
+    def __init__(self, match, normalised_text):
+        self.match = match
+        self.string = normalised_text.original
+        self._span = normalised_text.original_span(*match.span())
+
+    def span(self):
+        return self._span
+
+    def start(self):
+        return self._span[0]
+
+    def end(self):
+        return self._span[1]
+
+    def group(self):
+        """Returns the matched part of the original text"""
+        return self.string[self._span[0]:self._span[1]]
+
+    def __repr__(self):
+        return "<NormalisedMatch span={} match={!r}>".format(self._span, self.group())
+
+
+class NormalisedMatcher:
+    """Applies a RegexMatcher to the normalised view of a text (see NormalisedText)
+    The regex of the wrapped matcher only has to match lowercased text without accents, which makes it possible to
+    write simpler regexes and to drop the IGNORECASE flag. The returned matches report spans of the original text.
+    """
+
+    def __init__(self, matcher):
+        self.matcher = matcher
+
+    def config_key(self):
+        """See RegexMatcher.config_key"""
+        return type(self).__name__, self.matcher.config_key()
+
+    def match(self, text):
+        """text is either a string or a NormalisedText. Passing a NormalisedText avoids normalising the same text
+        once per matcher when several matchers are applied to it"""
+        if not isinstance(text, NormalisedText):
+            text = NormalisedText(text)
+        return [NormalisedMatch(elem, text) for elem in self.matcher.match(text.text)]
@@ -0,0 +1,110 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+
+LabelledSpan = namedtuple("LabelledSpan", ["start", "end", "label"])
+LabelledSpan.__doc__ = """A span (start, end) of a text, tagged with the label of the matcher which found it"""
+
+# Overlap resolution policies
+LONGEST = "longest"  # The longest span wins (the one starting first if equally long)
+PRIORITY = "priority"  # The span of the matcher with the highest priority wins (the longest if equal priority)
+NESTED = "nested"  # Spans nested inside another span are all kept. Of two crossing spans the first one wins
+
+
+def collect_spans(text, matchers, extra_spans=()):
+    """Applies every matcher to text and returns the combined list of LabelledSpans
+    matchers is a dict which maps labels to matchers (any object with a match method returning objects with a span
+    method, like a RegexMatcher)
+    extra_spans are (start, end, label) tuples found by other means"""
+    spans = [LabelledSpan(*span) for span in extra_spans]
+    for label, matcher in matchers.items():
+        for elem in matcher.match(text):
+            start, end = elem.span()
+            spans.append(LabelledSpan(start, end, label))
+    return spans
+
+
+def resolve_overlaps(spans, policy=LONGEST, priorities=None):
+    """Resolves the overlaps between (start, end, label) spans, and returns the remaining spans sorted by position
+    For policies LONGEST and PRIORITY the result does not contain overlapping spans.
+    priorities is a list of labels, from highest to lowest priority (labels not in the list come last). It decides
+    which span wins for policy PRIORITY, and breaks ties between equally long spans for policy LONGEST
+    Runs in O(n log n) for n spans, independent of the length of the text"""
+    spans = [span for span in spans if span[1] > span[0]]
+    if policy == NESTED:
+        return _resolve_nested(spans)
+
+    if priorities is None:
+        priorities = []
+    ranks = {label: rank for rank, label in enumerate(priorities)}
+    default_rank = len(priorities)
+    if policy == LONGEST:
+        spans.sort(key=lambda span: (span[0] - span[1], span[0], ranks.get(span[2], default_rank)))
+    elif policy == PRIORITY:
+        spans.sort(key=lambda span: (ranks.get(span[2], default_rank), span[0] - span[1], span[0]))
+    else:
+        raise ValueError("Unknown overlap policy: " + str(policy))
+
+    kept = _DisjointIntervals()
+    res = [span for span in spans if kept.add_if_free(span[0], span[1])]
+    res.sort()
+    return res
+
+
+def _resolve_nested(spans):
+    """Keeps all spans which are either disjoint from or nested in the previously kept spans
+    Sweeps over the spans sorted by start (longest first), keeping a stack of the kept spans which are still open"""
+    spans.sort(key=lambda span: (span[0], -span[1]))
+    res = []
+    open_spans = []
+    for span in spans:
+        while open_spans and open_spans[-1][1] <= span[0]:
+            open_spans.pop()
+        if open_spans and open_spans[-1][1] < span[1]:
+            continue  # Crosses the end of a kept span
+        res.append(span)
+        open_spans.append(span)
+    return res
+
+
+class _DisjointIntervals:
+    """Sorted set of non-overlapping intervals (start, end)
+    As the intervals do not overlap, sorting them by start also sorts them by end, so the neighbours of a new interval
+    are found with a binary search. The intervals are kept in blocks of bounded size (like a B-tree with two levels), so
+    an insertion only moves the elements of one block"""
+
+    _MAX_BLOCK_SIZE = 1024
+
+    def __init__(self):
+        self._blocks = []  # Sorted lists of intervals, none of them empty
+        self._firsts = []  # Start of the first interval of each block
+
+    def add_if_free(self, start, end):
+        """Adds the interval (start, end) if it overlaps none of the intervals in the set, and returns whether it was
+        added"""
+        if not self._blocks:
+            self._blocks.append([(start, end)])
+            self._firsts.append(start)
+            return True
+        # The block which should contain the interval: the last one starting at or before start (or the first one)
+        j = max(bisect_right(self._firsts, start) - 1, 0)
+        block = self._blocks[j]
+        i = bisect_left(block, (start,))
+        if i > 0 and block[i - 1][1] > start:
+            return False
+        if i < len(block):
+            next_start = block[i][0]
+        elif j + 1 < len(self._blocks):
+            next_start = self._firsts[j + 1]
+        else:
+            next_start = None
+        if next_start is not None and next_start < end:
+            return False
+        block.insert(i, (start, end))
+        if i == 0:
+            self._firsts[j] = start
+        if len(block) > self._MAX_BLOCK_SIZE:
+            half = len(block) // 2
+            self._blocks[j:j + 1] = [block[:half], block[half:]]
+            self._firsts.insert(j + 1, block[half][0])
+        return True
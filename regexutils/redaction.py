@@ -0,0 +1,131 @@
+from bisect import bisect_right
+from collections import namedtuple
+from regexutils.overlap import collect_spans, resolve_overlaps, LONGEST, NESTED
+
+
+RedactedSpan = namedtuple("RedactedSpan", ["original_start", "original_end", "start", "end", "label"])
+RedactedSpan.__doc__ = """A replaced part of a text: its span in the original text, its span in the redacted text and
+its label"""
+
+
+class MaskPolicy:
+    """Replaces every character of a match by a mask character (keeps the length of the text)"""
+
+    def __init__(self, mask_char="*"):
+        self.mask_char = mask_char
+
+    def __call__(self, label, text):
+        return self.mask_char * len(text)
+
+
+class PlaceholderPolicy:
+    """Replaces a match by a placeholder, which can contain the label of the match (e.g. "[EMAIL]")"""
+
+    def __init__(self, template="[{label}]"):
+        self.template = template
+
+    def __call__(self, label, text):
+        return self.template.format(label=label)
+
+
+class PseudonymPolicy:
+    """Replaces a match by a pseudonym, where the same text always gets the same pseudonym
+    (e.g. every occurrence of "Jose Aguilar" becomes "full_name_1" and every occurrence of "Luís Ferreira" becomes
+    "full_name_2"). The pseudonyms are remembered for as long as the policy object lives, so reusing it for several
+    documents keeps the pseudonyms consistent across them"""
+
+    def __init__(self, template="{label}_{nr}"):
+        self.template = template
+        self.pseudonyms = {}
+        self._counters = {}
+
+    def __call__(self, label, text):
+        key = (label, text)
+        pseudonym = self.pseudonyms.get(key)
+        if pseudonym is None:
+            nr = self._counters.get(label, 0) + 1
+            self._counters[label] = nr
+            pseudonym = self.template.format(label=label, nr=nr)
+            self.pseudonyms[key] = pseudonym
+        return pseudonym
+
+
+class RedactionResult:
+    """The result of redacting a text
+    text is the redacted text (None if it was written to a file-like object instead)
+    spans is the list of RedactedSpans, sorted by position, which maps the original text to the redacted text"""
+
+    def __init__(self, text, spans):
+        self.text = text
+        self.spans = spans
+        self._original_ends = [span.original_end for span in spans]
+
+    def redacted_index(self, original_index):
+        """Maps an index of the original text to the corresponding index of the redacted text
+        An index inside a replaced part of the text is mapped to the start of its replacement"""
+        i = bisect_right(self._original_ends, original_index)
+        if i < len(self.spans) and self.spans[i].original_start < original_index:
+            return self.spans[i].start
+        if i == 0:
+            return original_index
+        previous = self.spans[i - 1]
+        return original_index - previous.original_end + previous.end
+
+
+class Redactor:
+    """Anonymises texts by replacing everything found by a set of matchers
+    Every matcher gets a label, and every label gets a replacement policy: a callable which receives the label and the
+    matched text and returns the replacement (see MaskPolicy, PlaceholderPolicy and PseudonymPolicy).
+    The text is rewritten in a single pass over the sorted matches.
+    Overlapping matches are resolved with overlap.resolve_overlaps (by default the longest match wins)
+    """
+
+    def __init__(self, matchers, policies=None, default_policy=None, overlap_policy=LONGEST, priorities=None):
+        """matchers is a dict which maps labels to matchers (any object with a match method returning objects with a
+        span method, like a RegexMatcher)
+        policies is a dict which maps labels to replacement policies. Labels without policy use the default policy
+        (a PlaceholderPolicy if not specified)
+        overlap_policy and priorities are passed to overlap.resolve_overlaps. Policy NESTED is not allowed, as nested
+        matches cannot be replaced independently"""
+        if overlap_policy == NESTED:
+            raise ValueError("Nested matches cannot be redacted")
+        self.matchers = dict(matchers)
+        self.policies = dict(policies) if policies is not None else {}
+        self.default_policy = default_policy if default_policy is not None else PlaceholderPolicy()
+        self.overlap_policy = overlap_policy
+        self.priorities = priorities
+
+    def find_spans(self, text, extra_spans=()):
+        """Returns the sorted, non-overlapping list of (start, end, label) tuples to replace in text
+        extra_spans are (start, end, label) tuples found by other means (e.g. see doc_spans)"""
+        spans = collect_spans(text, self.matchers, extra_spans)
+        return resolve_overlaps(spans, self.overlap_policy, self.priorities)
+
+    def redact(self, text, out=None, extra_spans=()):
+        """Returns a RedactionResult with the redacted version of text
+        If out (a file-like object) is specified, the redacted text is written to it instead of being returned"""
+        pieces = []
+        write = out.write if out is not None else pieces.append
+        redacted_spans = []
+        pos = 0
+        redacted_pos = 0
+        for start, end, label in self.find_spans(text, extra_spans):
+            if start > pos:
+                write(text[pos:start])
+                redacted_pos += start - pos
+            policy = self.policies.get(label, self.default_policy)
+            replacement = policy(label, text[start:end])
+            write(replacement)
+            redacted_spans.append(RedactedSpan(start, end, redacted_pos, redacted_pos + len(replacement), label))
+            redacted_pos += len(replacement)
+            pos = end
+        if pos < len(text):
+            write(text[pos:])
+        redacted_text = "".join(pieces) if out is None else None
+        return RedactionResult(redacted_text, redacted_spans)
+
+
+def doc_spans(doc, extension_name="full_names", label="full_name"):
+    """Returns the (start, end, label) tuples of the spacy spans stored in a Doc extension (by default the full names
+    tagged by spacyrules.FullNameMatcher), to be passed as extra_spans to a Redactor"""
+    return [(span.start_char, span.end_char, label) for span in doc._.get(extension_name)]
@@ -1,6 +1,11 @@
-from regex import regex
+from array import array
+import heapq
+import re
 import csv
+import datetime
 import files
+from regexutils import backends
+from regexutils.backends import compile_regex
 try:
     import importlib.resources as pkg_resources
 except ImportError:
@@ -14,19 +19,25 @@ class MultiWordRegexBuilder:
     Each word is separated from another word by 1 or potentially more "separators"
         (space, tab... Can be defined by user)
     A word can be made optional. If a word is optional, the regex matches it both if the word is present or not
+    If capturing is False, the builder only uses non-capturing groups, except for the words given a name (these become
+    named groups). This makes matching faster and the match objects smaller
     """
     #ToDo Note: there is currently a bug with making the first or last word optional.
-    def __init__(self, separators=r"([\p{P}\s])", max_separators=3):
+    def __init__(self, separators=None, max_separators=3, capturing=True):
         """Take care to define the possible separators as a valid regex between square brackets
-            (making them separate options), as in the standard value
+            (making them separate options), as in the standard value (see default_separators)
             max_separators defines the maximal amount of separators allowed between separate words matched by the
             final multiword regex"""
         self._regex_words = []
         self._optionals = []
-        self.separators = separators
+        self.capturing = capturing
+        self.separators = separators if separators is not None else default_separators(capturing)
         self.max_separators = max_separators
 
-    def add_regex_word(self, regex_word, optional=False):
+    def add_regex_word(self, regex_word, optional=False, name=None):
+        """If a name is given, the word becomes a named group"""
+        if name is not None:
+            regex_word = named_group(name, regex_word)
         self._regex_words.append(regex_word)
         self._optionals.append(optional)
 
@@ -40,8 +51,10 @@ class MultiWordRegexBuilder:
             raise ValueError("The last argument of the regex cannot be optional (this is a temprary fix "
                              "to avoid a bug")
 
-        # look behind: start of string or separator
-        regex_start = "(?<=^|" + self.separators + ")("
+        group_start = group_opening(self.capturing)
+        # look behind: start of string or separator (written so that the look behind has a fixed width, as required
+        # by the re module)
+        regex_start = "(?:^|(?<=" + self.separators + "))" + group_start
         # Look ahead: end of string or separator. Any separator after the match is not consumed
         regex_end = ")(?=" + self.separators + "|$)"
         separator_str = self.separators + "{1," + str(self.max_separators) + "}"
@@ -49,7 +62,7 @@ class MultiWordRegexBuilder:
         for i in range(0, len(self._regex_words) - 1):
             word_regex = self._regex_words[i]
             if self._optionals[i]:
-                res += "(" + word_regex + separator_str + ")" + "?"
+                res += group_start + word_regex + separator_str + ")" + "?"
             else:
                 res += word_regex + separator_str
         res += self._regex_words[-1]
@@ -61,35 +74,47 @@ class MultiWordRegexBuilder:
     def __str__(self):
         return self.build()
 
+    def compile(self, flags=0, backend=None):
+        """Builds the regex and compiles it with the given backend (see backends.compile_regex)"""
+        return compile_regex(self.build(), flags, backend)
+
 
 class SingleWordRegexBuilder:
     """Creates regexes which can be used to match individual words
     Contains functionality for the creation of disjunctive regexes: regexes which consist of a series of or-options
         Useful for example when creating a regex which matches any of a list of words (e.g. all countries in the world)
+    If capturing is False, the builder only uses non-capturing groups, except for the options given a name (these
+    become named groups). This makes matching faster and the match objects smaller
     """
 
-    def __init__(self, word_sep_tokens=r"([\p{P}\s])"):
+    def __init__(self, word_sep_tokens=None, capturing=True):
         """Take care to define the possible separators a valid regex between square brackets
-            (making them separate options), as in the standard value"""
+            (making them separate options), as in the standard value (see default_separators)"""
         self._possibilities = []
-        self.separators = word_sep_tokens
+        self.capturing = capturing
+        self.separators = word_sep_tokens if word_sep_tokens is not None else default_separators(capturing)
 
     def build(self):
         """Returns the total regex, ensuring it only matches words and not subwords ("Hi" will match
         string "I say Hi" but not "I say Hiii" or "I say aHi"""
         if len(self._possibilities) == 0:
             return ""
-        regex_start = "(?<=^|" + self.separators + ")(" #look behind
+        group_start = group_opening(self.capturing)
+        regex_start = "(?:^|(?<=" + self.separators + "))" + group_start #look behind
         regex_end = ")(?=" + self.separators + "|$)" #Look ahead: any punctuation after the match is not consumed
         if len(self._possibilities) == 1:
             return regex_start + self._possibilities[0] + regex_end
         res = regex_start
         for i in range(0, len(self._possibilities)-1):
             pos = self._possibilities[i]
-            res += "(" + pos + ")" + "|"
-        res += "(" + self._possibilities[-1] + ")" + regex_end
+            res += group_start + pos + ")" + "|"
+        res += group_start + self._possibilities[-1] + ")" + regex_end
         return res
 
+    def compile(self, flags=0, backend=None):
+        """Builds the regex and compiles it with the given backend (see backends.compile_regex)"""
+        return compile_regex(self.build(), flags, backend)
+
     def build_as_part(self):
         """Returns the total regex as is, without taking into account whether or not it starts at the beginning
         of a word and ends at the end of a word"""
@@ -97,23 +122,27 @@ class SingleWordRegexBuilder:
             return ""
         if len(self._possibilities) == 1:
             return self._possibilities[0]
-        res = "("
+        group_start = group_opening(self.capturing)
+        res = group_start
         for i in range(0, len(self._possibilities)-1):
             pos = self._possibilities[i]
             res += pos + "|"
-        res += "(" + self._possibilities[-1] + "))"
+        res += group_start + self._possibilities[-1] + "))"
         return res
 
-    def add_option(self, new_regex):
+    def add_option(self, new_regex, name=None):
+        """If a name is given, the option becomes a named group"""
+        if name is not None:
+            new_regex = named_group(name, new_regex)
         self._possibilities.append(new_regex)
 
-    def add_list_options_as_regex(self, options):
-        to_add = self.gen_list_options_as_regex(options)
-        self._possibilities.append(to_add)
+    def add_list_options_as_regex(self, options, name=None):
+        to_add = self.gen_list_options_as_regex(options, self.capturing)
+        self.add_option(to_add, name)
 
     @staticmethod
-    def gen_list_options_as_regex(options):
-        res = r"("
+    def gen_list_options_as_regex(options, capturing=True):
+        res = group_opening(capturing)
         first = True
         for option in options:
             if not first:
@@ -124,15 +153,45 @@ class SingleWordRegexBuilder:
         return res
 
 
+def default_separators(capturing=True):
+    """The default word separators: punctuation and white space"""
+    return r"([\p{P}\s])" if capturing else r"[\p{P}\s]"
+
+
+def group_opening(capturing=True):
+    """Returns the opening of a capturing or a non-capturing group"""
+    return "(" if capturing else "(?:"
+
+
+def named_group(name, group_regex):
+    return "(?P<" + name + ">" + group_regex + ")"
+
+
 class RegexMatcher:
     """Class which stores a compiled regex and which can apply it to text and return a list of matches
     Extend this class to create specific classes which implement a regex
     The implementing subclass should pass its regex to this class's constructor (using super)
-    It can be applied to a text by using the match method"""
-
-    def __init__(self, matcher_regex):
-        """matcher_regex must be a compiled regex"""
+    It can be applied to a text by using the match method
+    The matchers of this package take a backend argument, which selects the regex engine their regex is compiled with
+    (see backends.compile_regex)"""
+
+    # Value for max_context: the regex never matches across a white space character, and an attempt to match it at a
+    # position only looks at the text up to the first white space after that position (and at the preceding character)
+    WITHIN_TOKEN = "token"
+
+    def __init__(self, matcher_regex, max_context=None):
+        """matcher_regex must be a compiled regex
+        max_context describes how much text around a position is looked at when trying to match the regex at that
+        position: the number of characters c such that only text[pos-c:pos+c] is looked at, or WITHIN_TOKEN, or None
+        if unknown. It is used to limit the text to rescan after an edit (see incremental.IncrementalSession)"""
         self.matcher_regex = matcher_regex
+        self.max_context = max_context
+
+    def config_key(self):
+        """Returns a hashable key which identifies what this matcher matches: matchers with equal keys return the same
+        matches (see cache.CachedMatcher)"""
+        pattern = self.matcher_regex
+        return type(self).__name__, type(pattern).__module__, pattern.pattern, pattern.flags
 
     def match(self, text):
         """Applies a regex and returns a list of matches"""
@@ -142,75 +201,190 @@ class RegexMatcher:
             res.append(elem)
         return res
 
+    def contains(self, text):
+        """Returns whether the regex matches anywhere in text, stopping at the first match"""
+        return self.matcher_regex.search(text) is not None
+
+    def count(self, text):
+        """Returns the number of matches in text, without keeping the matches (every match is dropped as soon as it
+        is counted)"""
+        return sum(1 for _ in self.matcher_regex.finditer(text))
+
+    def first(self, text):
+        """Returns the first match in text, or None if there is none"""
+        return self.matcher_regex.search(text)
+
+    def contains_batch(self, texts):
+        """Applies contains to every text, and returns the results as an array of bytes (1 if the text contains a match,
+        0 otherwise)"""
+        return array("B", map(self.contains, texts))
+
+    def count_batch(self, texts):
+        """Applies count to every text, and returns the results as an array of unsigned integers"""
+        return array("L", map(self.count, texts))
+
+
+class CombinedMatcher(RegexMatcher):
+    """Combines several matchers into a single matcher, which finds the matches of all of them
+    The matches of different matchers can overlap (see the overlap module to resolve this)
+    A CombinedMatcher has no regex of its own (its matcher_regex is None): code which applies the regex of a matcher
+    directly handles the matchers it combines one by one (see incremental.IncrementalSession)"""
+
+    def __init__(self, matchers):
+        self.matchers = list(matchers)
+        super().__init__(None)
+
+    def config_key(self):
+        """See RegexMatcher.config_key"""
+        return type(self).__name__, tuple(matcher.config_key() for matcher in self.matchers)
+
+    def match(self, text):
+        """Returns the matches of all matchers, sorted by start position"""
+        return list(heapq.merge(*[matcher.match(text) for matcher in self.matchers], key=lambda elem: elem.start()))
+
+    def contains(self, text):
+        return any(matcher.contains(text) for matcher in self.matchers)
+
+    def count(self, text):
+        return sum(matcher.count(text) for matcher in self.matchers)
+
+    def first(self, text):
+        """Returns the match starting first in text (of the first matcher if several start at the same position), or
+        None if there is none"""
+        res = None
+        for matcher in self.matchers:
+            elem = matcher.first(text)
+            if elem is not None and (res is None or elem.start() < res.start()):
+                res = elem
+        return res
+
 
 class CIFMatcher(RegexMatcher):
 
-    def __init__(self):
-        cif_regex_1 = r"[A-Z]\d{7,7}([A-Z]|\d)"
+    def __init__(self, backend=None):
+        cif_regex_1 = r"[A-Z]\d{7,7}[A-Z\d]"
         cif_regex_2 = r"[A-Z]-\d\d\.\d{3,3}\.\d{3,3}"
-        regex_builder = SingleWordRegexBuilder()
+        regex_builder = SingleWordRegexBuilder(capturing=False)
         regex_builder.add_option(cif_regex_1)
         regex_builder.add_option(cif_regex_2)
         tot_regex = regex_builder.build()
-        matcher_regex = regex.compile(tot_regex, flags=regex.IGNORECASE)
-        super().__init__(matcher_regex)
+        matcher_regex = compile_regex(tot_regex, flags=re.IGNORECASE, backend=backend)
+        super().__init__(matcher_regex, max_context=self.WITHIN_TOKEN)
 
 
 class DNIMatcher(RegexMatcher):
 
-    def __init__(self):
+    def __init__(self, backend=None):
         dni_regex_1 = r"\d{8,8}[A-Z]"
         dni_regex_2 = r"\d\d\.\d{3,3}\.\d{3,3}-[A-Z]"
-        regex_builder = SingleWordRegexBuilder()
+        regex_builder = SingleWordRegexBuilder(capturing=False)
         regex_builder.add_option(dni_regex_1)
         regex_builder.add_option(dni_regex_2)
         tot_regex = regex_builder.build()
-        matcher_regex = regex.compile(tot_regex, flags=regex.IGNORECASE)
-        super().__init__(matcher_regex)
+        matcher_regex = compile_regex(tot_regex, flags=re.IGNORECASE, backend=backend)
+        super().__init__(matcher_regex, max_context=self.WITHIN_TOKEN)
 
 
 class EmailMatcher(RegexMatcher):
 
-    def __init__(self):
+    def __init__(self, backend=None):
         # based onhttps://www.regular-expressions.info/email.html
         email_regex = r"[A-Z\d\.\_%\+\-]+@[A-Z\d\.\-]+\.[A-Z]{2,}"
-        regex_builder = SingleWordRegexBuilder()
+        regex_builder = SingleWordRegexBuilder(capturing=False)
         regex_builder.add_option(email_regex)
         tot_regex = regex_builder.build()
-        matcher_regex = regex.compile(tot_regex, flags=regex.IGNORECASE)
-        super().__init__(matcher_regex)
+        matcher_regex = compile_regex(tot_regex, flags=re.IGNORECASE, backend=backend)
+        super().__init__(matcher_regex, max_context=self.WITHIN_TOKEN)
 
 
 class DateMatcher(RegexMatcher):
     """Logic to find dates in Spanish texts
+    The day, month and year of a date are the named groups "day", "month" and "year" of its match. The parse method
+    converts them to a datetime.date
     """
 
     MONTHS_FILE_NAME = "spanish_months.txt"
     NRS_FILE_NAME = "spanish_numbers.txt"
 
-    def __init__(self):
+    def __init__(self, backend=None):
         self.written_numbers = self.read_numbers_file()
         self.months = self.read_months_file()
+        # Lookup tables from the casefolded words to their values: the files list the numbers from 1 and the months
+        # from January on
+        self.day_values = {number.casefold(): i + 1 for i, number in enumerate(self.written_numbers)}
+        self.month_values = {month.casefold(): i + 1 for i, month in enumerate(self.months)}
 
-        day_nrs_regex = r"(([1-9])|(1[0-9])|(2[0-9])|(3[0-1]))"
-        de_regex = "(de)"
-        year_regex = r"((19[0-9][0-9])|(20[0-9][0-9]))"
+        day_nrs_regex = r"(?:[1-9]|1[0-9]|2[0-9]|3[0-1])"
+        de_regex = "de"
+        year_regex = r"(?:19[0-9][0-9]|20[0-9][0-9])"
 
-        b = MultiWordRegexBuilder()
-        wb1 = SingleWordRegexBuilder()
+        b = MultiWordRegexBuilder(capturing=False)
+        wb1 = SingleWordRegexBuilder(capturing=False)
         wb1.add_list_options_as_regex(self.written_numbers)
         wb1.add_option(day_nrs_regex)
-        b.add_regex_word(wb1.build_as_part())
+        b.add_regex_word(wb1.build_as_part(), name="day")
         b.add_regex_word(de_regex, optional=True)
-        wb3 = SingleWordRegexBuilder()
+        wb3 = SingleWordRegexBuilder(capturing=False)
         wb3.add_list_options_as_regex(self.months)
-        b.add_regex_word(wb3.build_as_part())
+        b.add_regex_word(wb3.build_as_part(), name="month")
         b.add_regex_word(de_regex, optional=True)
-        b.add_regex_word(year_regex)
+        b.add_regex_word(year_regex, name="year")
         tot_regex = b.build()
 
-        matcher_regex = regex.compile(tot_regex, flags=regex.IGNORECASE)
-        super().__init__(matcher_regex)
+        matcher_regex = compile_regex(tot_regex, flags=re.IGNORECASE, backend=backend)
+        # Longest possible match, plus one character of context on both sides
+        max_date_length = max(map(len, self.written_numbers)) + max(map(len, self.months)) + 2 * len("de") + \
+            len("2019") + 4 * b.max_separators
+        super().__init__(matcher_regex, max_context=max_date_length + 1)
+
+        # The regex engine does not fold the case of all characters like str.casefold (e.g. "İ" and "ı"): the words
+        # which are not in the lookup tables are looked up with a regex compiled by the same engine, in which the
+        # number of the group matching a word is its value
+        lookup_backend = backends.RE if isinstance(matcher_regex, re.Pattern) else backends.REGEX
+        self._day_lookup_regex = compile_regex(self.gen_lookup_regex(self.written_numbers), flags=re.IGNORECASE,
+                                               backend=lookup_backend)
+        self._month_lookup_regex = compile_regex(self.gen_lookup_regex(self.months), flags=re.IGNORECASE,
+                                                 backend=lookup_backend)
+
+    @staticmethod
+    def gen_lookup_regex(words):
+        return "|".join("(" + word + ")" for word in words)
+
+    @staticmethod
+    def lookup(word, values, lookup_regex):
+        """Returns the value of a written number or month (None if it is unknown)"""
+        value = values.get(word.casefold())
+        if value is None:
+            match = lookup_regex.fullmatch(word)
+            if match is not None:
+                value = match.lastindex
+        return value
+
+    def to_date(self, match):
+        """Returns the datetime.date of a match of this matcher, or None if it is not a valid date (like 31 de
+        febrero de 2019)"""
+        day, month, year = match.group("day", "month", "year")
+        if day.isdigit():
+            day = int(day)
+        else:
+            day = self.lookup(day, self.day_values, self._day_lookup_regex)
+        month = self.lookup(month, self.month_values, self._month_lookup_regex)
+        if day is None or month is None:
+            return None
+        try:
+            return datetime.date(int(year), month, day)
+        except ValueError:
+            return None
+
+    def parse(self, text):
+        """Finds the dates in text and returns a list of (span, datetime.date) tuples, in a single scan of the text
+        Matches which are not valid dates are left out"""
+        res = []
+        for elem in self.matcher_regex.finditer(text):
+            date = self.to_date(elem)
+            if date is not None:
+                res.append((elem.span(), date))
+        return res
 
     @classmethod
     def read_numbers_file(cls):
@@ -234,29 +408,30 @@ class DateMatcher(RegexMatcher):
 class CompanyExtensionMatcher(RegexMatcher):
     """Logic to match business terminations from all over the world (like S.A., B.V.B.A.)"""
     COMPANY_EXTENSIONS = "bussiness_terminations.txt"
-    def __init__(self):
+    def __init__(self, backend=None):
         file = pkg_resources.open_text(files, self.COMPANY_EXTENSIONS)
         file_lines = file.readlines()
         file.close()
         companies = []
         for line in file_lines:
             companies.append(line.strip().replace(".", "\."))
-        builder = SingleWordRegexBuilder()
+        builder = SingleWordRegexBuilder(capturing=False)
         builder.add_list_options_as_regex(companies)
         comp_regex = builder.build()
-        matcher_regex = regex.compile(comp_regex)
-        super().__init__(matcher_regex)
+        matcher_regex = compile_regex(comp_regex, backend=backend)
+        # Some extensions contain spaces. One character of context is needed on both sides of the extension
+        super().__init__(matcher_regex, max_context=max(len(line.strip()) for line in file_lines) + 1)
 
 
 class HashTagMatcher(RegexMatcher):
     """Matches twitter hashtags (#TAG)"""
-    def __init__(self):
-        ht_regex = r"[＃#]{1}(\w+)"
-        regex_builder = SingleWordRegexBuilder()
+    def __init__(self, backend=None):
+        ht_regex = r"[＃#]{1}(?P<tag>\w+)"
+        regex_builder = SingleWordRegexBuilder(capturing=False)
         regex_builder.add_option(ht_regex)
         tot_regex = regex_builder.build()
-        matcher_regex = regex.compile(tot_regex, flags=regex.IGNORECASE)
-        super().__init__(matcher_regex)
+        matcher_regex = compile_regex(tot_regex, flags=re.IGNORECASE, backend=backend)
+        super().__init__(matcher_regex, max_context=self.WITHIN_TOKEN)
 
 
 class SpanishDemonstrativePronounsMatcher(RegexMatcher):
@@ -285,22 +460,22 @@ class SpanishDemonstrativePronounsMatcher(RegexMatcher):
         "ésos",
     ]
 
-    def __init__(self):
-        regex_builder = SingleWordRegexBuilder(word_sep_tokens=r"([\p{P}\s])") #All punctuation and white space chars
+    def __init__(self, backend=None):
+        regex_builder = SingleWordRegexBuilder(word_sep_tokens=r"[\p{P}\s]", capturing=False) #All punctuation and white space chars
         regex_builder.add_list_options_as_regex(self.WORDS_TO_MATCH_LOWERCASED)
         tot_regex = regex_builder.build()
-        matcher_regex = regex.compile(tot_regex, flags=regex.IGNORECASE)
-        super().__init__(matcher_regex)
+        matcher_regex = compile_regex(tot_regex, flags=re.IGNORECASE, backend=backend)
+        super().__init__(matcher_regex, max_context=self.WITHIN_TOKEN)
 
 
 class MentionMatcher(RegexMatcher):
     """Matches twitter mentions (@USERNAME)"""
-    def __init__(self):
-        mention_regex = r"[＠@]{1}([\w_]+)"
-        regex_builder = SingleWordRegexBuilder()
+    def __init__(self, backend=None):
+        mention_regex = r"[＠@]{1}(?P<user>[\w_]+)"
+        regex_builder = SingleWordRegexBuilder(capturing=False)
         regex_builder.add_option(mention_regex)
         tot_regex = regex_builder.build()
-        matcher_regex = regex.compile(tot_regex, flags=regex.IGNORECASE)
-        super().__init__(matcher_regex)
+        matcher_regex = compile_regex(tot_regex, flags=re.IGNORECASE, backend=backend)
+        super().__init__(matcher_regex, max_context=self.WITHIN_TOKEN)
 
 
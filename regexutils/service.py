@@ -0,0 +1,243 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+import json
+import multiprocessing
+
+
+class ServiceOverloaded(Exception):
+    """Raised when a MatchingService has too many pending requests to accept a new one"""
+
+
+class RequestTooLarge(ValueError):
+    """Raised when a text is longer than the maximum a MatchingService accepts"""
+
+
+# Matchers of a worker process, built once when the process starts
+_worker_matchers = None
+
+
+def _init_worker(matcher_factories):
+    global _worker_matchers
+    _worker_matchers = {name: factory() for name, factory in matcher_factories.items()}
+
+
+def _match_requests(requests, matchers=None):
+    """Applies the matchers to a batch of (matcher name, text) requests and returns the spans of the matches for each
+    Runs in the worker pool: if no matchers are given, those of the worker process are used"""
+    if matchers is None:
+        matchers = _worker_matchers
+    return [[elem.span() for elem in matchers[name].match(text)] for name, text in requests]
+
+
+class MatchingService:
+    """Applies pre-built matchers to texts in a bounded pool of worker threads or processes, without blocking the
+    asyncio event loop
+    Small requests arriving within a short delay of each other are dispatched to the pool as a single batch.
+    The number of requests waiting for a result is limited: when the limit is reached new requests are refused with
+    ServiceOverloaded, a signal to the client to back off
+    """
+
+    def __init__(self, matcher_factories, max_workers=4, use_processes=False, max_text_length=1000000,
+                 max_pending=256, batch_size=32, batch_max_length=2000, batch_delay=0.001):
+        """matcher_factories is a dict which maps the names of the matchers to callables creating them (e.g. the
+        matcher classes). They must be picklable when use_processes is True, as every process builds its own matchers
+        Texts of up to batch_max_length characters are batched, with up to batch_size texts per batch. A batch is
+        dispatched when it is full or batch_delay seconds after its first request"""
+        self.matcher_names = set(matcher_factories)
+        if use_processes:
+            # Forked workers would inherit the sockets of the open connections, keeping them open after they are closed
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._executor = ProcessPoolExecutor(max_workers, mp_context=multiprocessing.get_context(start_method),
+                                                 initializer=_init_worker, initargs=(matcher_factories,))
+            self._match = _match_requests
+        else:
+            matchers = {name: factory() for name, factory in matcher_factories.items()}
+            self._executor = ThreadPoolExecutor(max_workers)
+            self._match = partial(_match_requests, matchers=matchers)
+        self.max_text_length = max_text_length
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.batch_max_length = batch_max_length
+        self.batch_delay = batch_delay
+        self._pending = 0
+        self._batch = []
+        self._batch_timer = None
+
+    @property
+    def queue_depth(self):
+        """The number of requests waiting for a result"""
+        return self._pending
+
+    async def amatch(self, name, text):
+        """Returns the spans (start, end) of the matches of the matcher with the given name in text"""
+        if name not in self.matcher_names:
+            raise KeyError(name)
+        if len(text) > self.max_text_length:
+            raise RequestTooLarge("Text of {} characters exceeds the maximum of {}".format(
+                len(text), self.max_text_length))
+        if self._pending >= self.max_pending:
+            raise ServiceOverloaded("{} requests pending".format(self._pending))
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            if len(text) > self.batch_max_length:
+                results = await loop.run_in_executor(self._executor, self._match, [(name, text)])
+                return results[0]
+            future = loop.create_future()
+            self._batch.append((name, text, future))
+            if len(self._batch) >= self.batch_size:
+                self._flush_batch()
+            elif self._batch_timer is None:
+                self._batch_timer = loop.call_later(self.batch_delay, self._flush_batch)
+            return await future
+        finally:
+            self._pending -= 1
+
+    def _flush_batch(self):
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        batch = self._batch
+        self._batch = []
+        if not batch:
+            return
+        requests = [(name, text) for name, text, future in batch]
+        loop = batch[0][2].get_loop()
+        try:
+            batch_future = loop.run_in_executor(self._executor, self._match, requests)
+        except Exception as e:
+            # E.g. the executor was shut down or a worker process died. Runs in a callback of the event loop, so the
+            # exception must be passed on to the callers
+            for name, text, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        batch_future.add_done_callback(partial(self._set_batch_results, batch))
+
+    @staticmethod
+    def _set_batch_results(batch, batch_future):
+        exception = batch_future.exception()
+        for i, (name, text, future) in enumerate(batch):
+            if future.done():
+                continue  # Cancelled by the caller
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(batch_future.result()[i])
+
+    def close(self):
+        """Dispatches the pending batch and shuts down the pool, waiting for the requests in progress
+        Blocks until these are done: use aclose in a coroutine"""
+        self._flush_batch()
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self):
+        """Dispatches the pending batch and shuts down the pool, without blocking the event loop while waiting for the
+        requests in progress"""
+        self._flush_batch()
+        await asyncio.get_running_loop().run_in_executor(None, partial(self._executor.shutdown, wait=True))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+
+async def start_server(service, host="127.0.0.1", port=0, path=None):
+    """Starts a minimal HTTP server in front of a MatchingService, on a TCP port or, if a path is given, on a Unix
+    socket. Returns the asyncio Server
+    A request "POST /match/<matcher name>" with the text as utf-8 body is answered with a JSON object
+    {"matches": [[start, end], ...]}. Unknown matchers give status 404, too large texts 413, and an overloaded service
+    503 with a Retry-After header. Malformed requests give status 400, and any other failure (e.g. a matcher which
+    raises) 500, after which the connection is closed"""
+    handler = partial(_handle_connection, service)
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path=path)
+    return await asyncio.start_server(handler, host=host, port=port)
+
+
+_STATUS_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                   500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+async def _handle_connection(service, reader, writer):
+    """Handles HTTP/1.1 requests on a connection until the client closes it"""
+    try:
+        while True:
+            try:
+                request_line, headers = await _read_request_head(reader)
+            except (ValueError, asyncio.LimitOverrunError):
+                # A line longer than the limit of the reader
+                _write_response(writer, 400, {"error": "Request line or header too long"}, {"Connection": "close"})
+                await writer.drain()
+                break
+            if not request_line:
+                break
+            status, body, extra_headers = await _handle_request(service, request_line, headers, reader)
+            _write_response(writer, status, body, extra_headers)
+            await writer.drain()
+            if headers.get("connection", "").lower() == "close" or extra_headers.get("Connection") == "close":
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _read_request_head(reader):
+    """Returns the request line and the headers (with lowercase keys) of the next request, or an empty request line if
+    the client closed the connection"""
+    request_line = await reader.readline()
+    headers = {}
+    if not request_line:
+        return request_line, headers
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            return request_line, headers
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+
+async def _handle_request(service, request_line, headers, reader):
+    """Returns the status, the JSON body and the extra headers of the response"""
+    parts = request_line.decode("latin-1").split()
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        length = -1
+    if length < 0:
+        return 400, {"error": "Invalid Content-Length"}, {"Connection": "close"}
+    # A character takes up to 4 bytes in utf-8
+    if length > 4 * service.max_text_length:
+        return 413, {"error": "Request too large"}, {"Connection": "close"}
+    body = await reader.readexactly(length)
+    if len(parts) != 3 or parts[0] != "POST" or not parts[1].startswith("/match/"):
+        return 404, {"error": "Use POST /match/<matcher name>"}, {}
+    name = parts[1][len("/match/"):]
+    try:
+        text = body.decode("utf-8")
+        matches = await service.amatch(name, text)
+    except KeyError:
+        return 404, {"error": "Unknown matcher: " + name}, {}
+    except UnicodeDecodeError:
+        return 400, {"error": "The text must be utf-8"}, {}
+    except RequestTooLarge as e:
+        return 413, {"error": str(e)}, {}
+    except ServiceOverloaded as e:
+        return 503, {"error": str(e)}, {"Retry-After": "1"}
+    except Exception as e:
+        # E.g. a matcher which raises, a broken process pool or a closed service
+        return 500, {"error": "Internal error: " + type(e).__name__}, {"Connection": "close"}
+    return 200, {"matches": matches}, {}
+
+
+def _write_response(writer, status, body, extra_headers):
+    data = json.dumps(body).encode("utf-8")
+    head = "HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\n".format(
+        status, _STATUS_REASONS[status], len(data))
+    for key, value in extra_headers.items():
+        head += "{}: {}\r\n".format(key, value)
+    writer.write(head.encode("latin-1") + b"\r\n" + data)
@@ -0,0 +1,127 @@
+import re
+import unittest
+from unittest import mock
+
+from regexutils import backends, regexes, unicodetables
+from regexutils.backends import UnsupportedPattern, compile_regex, translate_to_re
+
+
+class TestTranslation(unittest.TestCase):
+    def test_categories(self):
+        punctuation = re.compile(translate_to_re(r"\p{P}+"))
+        assert punctuation.fullmatch("¿!.,-_«»")
+        assert not punctuation.search("abc 12 +")
+        assert re.compile(translate_to_re(r"[\p{P}\s]")).fullmatch(" ")
+        assert re.compile(translate_to_re(r"\p{Lu}")).fullmatch("Ñ")
+        assert not re.compile(translate_to_re(r"\p{Lu}")).fullmatch("ñ")
+        assert re.compile(translate_to_re(r"\pL")).fullmatch("ñ")
+        assert not re.compile(translate_to_re(r"\P{L}")).fullmatch("ñ")
+        assert re.compile(translate_to_re(r"\p{^L}")).fullmatch("1")
+        assert re.compile(translate_to_re(r"[^\P{N}]")).fullmatch("7")
+
+    def test_same_matches(self):
+        # The translated patterns match the same characters as the regex module
+        regex = backends._regex_module()
+        text = "".join(map(chr, range(0x3000))) + "\U0001F600\U00010400\U00010428\U0001D7CE"
+        patterns = [r"\w", r"\W", r"\s", r"\S", r"\d", r"\D", r"\p{P}", r"\P{L}", r"\p{Lu}", r"[\p{P}\s]", r"[^\s.]",
+                    r"[\w_]", r"[A-Z\d\.\_%\+\-]", r"[^a-z]", r"[]a]", r"[a-]", r"\x41", "i", "I", "İ", "ı", "k", "ſ",
+                    r"\b", r"\B", r"\b\w+\b", r"(?<=\s)\S+", r"\d{2,}"]
+        for pattern in patterns:
+            for flags in [0, re.IGNORECASE]:
+                try:
+                    compiled = compile_regex(pattern, flags, backends.RE)
+                except UnsupportedPattern:
+                    # Only categories with cased characters, when ignoring case
+                    assert flags and "p" in pattern.lower()
+                    continue
+                assert [elem.span() for elem in compiled.finditer(text)] == \
+                    [elem.span() for elem in regex.finditer(pattern, text, flags=flags)], (pattern, flags)
+
+    def test_supplementary(self):
+        # Characters outside the Basic Multilingual Plane are matched by a separate alternative
+        symbol = re.compile(translate_to_re(r"[\p{So}x]"))
+        assert symbol.fullmatch("\U0001F600") and symbol.fullmatch("©") and symbol.fullmatch("x")
+        assert not symbol.fullmatch("a")
+        assert re.compile(translate_to_re(r"(?<=\p{So})a")).search("\U0001F600a")
+        assert not re.compile(translate_to_re(r"[^\p{So}]")).fullmatch("\U0001F600")
+
+    def test_unsupported(self):
+        for pattern in [r"[[:alpha:]]", r"(?:abc){e<=1}", r"\p{Foo}", r"\p{Script=Latin}", "abc\\", r"(?r)abc",
+                        r"(?i)abc", r"\Gabc", r"\X", r"(?<name>a)"]:
+            with self.assertRaises(UnsupportedPattern):
+                translate_to_re(pattern)
+        with self.assertRaises(UnsupportedPattern):
+            translate_to_re(r"\p{Lu}", re.IGNORECASE)
+        with self.assertRaises(UnsupportedPattern):
+            translate_to_re(r"(a)\1", re.IGNORECASE)
+        with self.assertRaises(UnsupportedPattern):
+            translate_to_re("a", re.VERBOSE)
+        # Falls back to the regex module
+        assert not isinstance(compile_regex(r"\p{Lu}", re.IGNORECASE, backends.AUTO), re.Pattern)
+
+    def test_tables_version(self):
+        def clear_caches():
+            for elem in vars(backends).values():
+                if hasattr(elem, "cache_clear"):
+                    elem.cache_clear()
+
+        clear_caches()
+        try:
+            with mock.patch.object(unicodetables, "REGEX_VERSION", "2019.12.9"):
+                with self.assertWarns(UserWarning):
+                    with self.assertRaises(UnsupportedPattern):
+                        translate_to_re(r"\p{P}")
+                assert not isinstance(compile_regex(r"\w+", backend=backends.AUTO), re.Pattern)
+                assert backends.fastest_backend(r"\w+") == backends.REGEX
+                # Patterns which do not need the tables are still translated
+                assert isinstance(compile_regex("abc", backend=backends.AUTO), re.Pattern)
+        finally:
+            clear_caches()
+        assert isinstance(compile_regex(r"\w+", backend=backends.AUTO), re.Pattern)
+
+
+class TestBackends(unittest.TestCase):
+    TEXT = "Pangea S.A. (h.degroote@pangeanic.com, @Hañz_í, #PaNíwrevña_2) firmó el 4 de noviembre de 2019 " \
+           "con DNI 50.083.695-E y CIF B97017461. Ésto fue el veintiséis  de---marzo de /2020! Aquél no sabe " \
+           "que 12345678Z es de Pangeanic S.L., ¿verdad @pepe? " \
+           "Texto NFD: #cafe\u0301 y @Jose\u0301, separadores C0: x\x1c12345678Z\x1fB97017461 @ana\x1d"
+
+    def test_compile(self):
+        assert isinstance(compile_regex(r"[\p{P}\s]", backend=backends.RE), re.Pattern)
+        assert not isinstance(compile_regex(r"[\p{P}\s]", backend=backends.REGEX), re.Pattern)
+        assert isinstance(compile_regex(r"[\p{P}\s]", backend=backends.AUTO), re.Pattern)
+        assert not isinstance(compile_regex(r"(?:abc){e<=1}", backend=backends.AUTO), re.Pattern)
+        assert compile_regex(r"[\p{P}\s]", backend=backends.FASTEST).search("a, b").span() == (1, 2)
+        assert compile_regex("abc", flags=re.IGNORECASE, backend=backends.RE).search("ABC")
+        with self.assertRaises(UnsupportedPattern):
+            compile_regex(r"(?:abc){e<=1}", backend=backends.RE)
+        with self.assertRaises(ValueError):
+            compile_regex("abc", backend="pcre")
+
+    def test_builder(self):
+        builder = regexes.SingleWordRegexBuilder()
+        builder.add_list_options_as_regex(["uno", "dos"])
+        pattern = builder.compile(backend=backends.RE)
+        assert [elem.span() for elem in pattern.finditer("uno, dos y tres")] == [(0, 3), (5, 8)]
+
+    def test_matchers(self):
+        matchers = [
+            regexes.CIFMatcher,
+            regexes.DNIMatcher,
+            regexes.EmailMatcher,
+            regexes.DateMatcher,
+            regexes.CompanyExtensionMatcher,
+            regexes.HashTagMatcher,
+            regexes.SpanishDemonstrativePronounsMatcher,
+            regexes.MentionMatcher,
+        ]
+        text = self.TEXT * 3
+        for matcher_class in matchers:
+            expected = [elem.span() for elem in matcher_class(backend=backends.REGEX).match(text)]
+            assert expected
+            for backend in [backends.RE, backends.AUTO, backends.FASTEST]:
+                assert [elem.span() for elem in matcher_class(backend=backend).match(text)] == expected
+
+
+if __name__ == '__main__':
+    unittest.main()
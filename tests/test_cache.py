@@ -0,0 +1,139 @@
+import threading
+import unittest
+
+from regexutils import regexes
+from regexutils.normalisation import NormalisedMatcher
+from regexutils.cache import ResultCache, CachedMatcher, CachedNameFinder
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_lru(self):
+        cache = ResultCache(max_entries=2)
+        assert cache.get_or_compute("upper", "a", str.upper) == "A"
+        assert cache.get_or_compute("upper", "b", str.upper) == "B"
+        assert cache.get_or_compute("upper", "a", str.upper) == "A"
+        cache.get_or_compute("upper", "c", str.upper)  # Evicts "b", the least recently used
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 3, 1, 2)
+        cache.get_or_compute("upper", "a", str.upper)
+        cache.get_or_compute("upper", "b", str.upper)
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (2, 4)
+
+        # The configuration key is part of the key
+        assert cache.get_or_compute("lower", "A", str.lower) == "a"
+
+    def test_max_bytes(self):
+        cache = ResultCache(max_bytes=100, sizeof=lambda text, result: len(result))
+        cache.get_or_compute(None, "a" * 60, str.upper)
+        cache.get_or_compute(None, "b" * 60, str.upper)
+        assert cache.stats().entries == 1
+        assert cache.stats().size_bytes == 60
+        cache.get_or_compute(None, "c" * 200, str.upper)  # Too large to be cached at all
+        assert cache.stats().entries == 1
+
+
+class TestCachedMatcher(unittest.TestCase):
+
+    def test(self):
+        cache = ResultCache()
+        email_matcher = CachedMatcher(regexes.EmailMatcher(), cache)
+        mention_matcher = CachedMatcher(regexes.MentionMatcher(), cache)
+        text = "Este es un correo: h.degroote@pangeanic.com y @Hans"
+        assert [elem.group() for elem in email_matcher.match(text)] == ["h.degroote@pangeanic.com"]
+        assert [elem.group() for elem in mention_matcher.match(text)] == ["@Hans"]
+        assert email_matcher.match(text) is email_matcher.match(text)
+        assert cache.stats().hits == 2
+        assert cache.stats().misses == 2
+        assert email_matcher.max_context == regexes.RegexMatcher.WITHIN_TOKEN
+
+        # Equally configured matchers share their results, matchers with another backend do not
+        assert CachedMatcher(regexes.EmailMatcher(), cache).match(text) is email_matcher.match(text)
+        assert CachedMatcher(regexes.EmailMatcher(backend="re"), cache).config_key != email_matcher.config_key
+
+    def test_other_matchers(self):
+        cache = ResultCache()
+        text = "Escribe a H.DEGROOTE@PANGEANIC.COM"
+        normalised_matcher = CachedMatcher(NormalisedMatcher(regexes.EmailMatcher()), cache)
+        assert [elem.span() for elem in normalised_matcher.match(text)] == [(10, 34)]
+        assert normalised_matcher.match(text) is normalised_matcher.match(text)
+
+        class UpperMatcher:
+            def match(self, text):
+                return [text.upper()]
+
+        combined_matcher = CachedMatcher(regexes.CombinedMatcher([regexes.EmailMatcher(), regexes.DNIMatcher()]),
+                                         cache)
+        text = "DNI 50.083.695-E, h.degroote@pangeanic.com"
+        assert [elem.span() for elem in combined_matcher.match(text)] == [(4, 16), (18, 42)]
+        assert combined_matcher.match(text) is combined_matcher.match(text)
+
+        upper_matcher = CachedMatcher(UpperMatcher(), cache)
+        assert upper_matcher.match("a") == ["A"]
+        assert CachedMatcher(UpperMatcher(), cache, config_key="upper").match("a") == ["A"]
+        assert cache.stats().misses == 4
+
+    def test_threads(self):
+        matcher = CachedMatcher(regexes.HashTagMatcher(), ResultCache(max_entries=5))
+        texts = ["Hi #tag{} and #other".format(i % 8) for i in range(400)]
+        errors = []
+
+        def run():
+            for text in texts:
+                if [elem.group() for elem in matcher.match(text)] != text.split()[1::2]:
+                    errors.append(text)
+
+        threads = [threading.Thread(target=run) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        stats = matcher.cache.stats()
+        assert stats.hits + stats.misses == 1600
+        assert stats.entries <= 5
+
+
+class TestCachedNameFinder(unittest.TestCase):
+
+    def test(self):
+        calls = []
+
+        class FakeSpan:
+            def __init__(self, start_char, end_char):
+                self.start_char, self.end_char = start_char, end_char
+
+        class FakeDoc:
+            def __init__(self, spans):
+                self._ = self
+                self.spans = spans
+
+            def get(self, name):
+                return self.spans
+
+        def nlp(text):
+            calls.append(text)
+            return FakeDoc([FakeSpan(0, 12)])
+
+        finder = CachedNameFinder(nlp)
+        assert finder.spans("Jose Aguilar va") == [(0, 12, "full_name")]
+        assert finder.spans("Jose Aguilar va") == [(0, 12, "full_name")]
+        assert calls == ["Jose Aguilar va"]
+
+        # Another pipeline does not get the results of the first one from a shared cache
+        def other_nlp(text):
+            calls.append(text)
+            return FakeDoc([FakeSpan(5, 12)])
+
+        cache = ResultCache()
+        assert CachedNameFinder(nlp, cache).spans("Jose Aguilar va") == [(0, 12, "full_name")]
+        assert CachedNameFinder(other_nlp, cache).spans("Jose Aguilar va") == [(5, 12, "full_name")]
+        # Finders with the same explicit config_key share their results
+        assert CachedNameFinder(other_nlp, cache, config_key="names").spans("Jose Aguilar va") == \
+            [(5, 12, "full_name")]
+        assert CachedNameFinder(nlp, cache, config_key="names").spans("Jose Aguilar va") == [(5, 12, "full_name")]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from regexutils import regexes
+from regexutils.incremental import IncrementalSession
+
+
+class TestIncrementalSession(unittest.TestCase):
+    TEXT = "Pangea S.A. (h.degroote@pangeanic.com, @Hañz_í, #PaNíwrevña_2) firmó el 4 de noviembre de 2019 " \
+           "con DNI 50.083.695-E y CIF B97017461. Ésto fue el veintiséis  de---marzo de /2020! "
+    INSERTIONS = ["", " ", "de ", "@", "#tag", "x", ".", "2019", "S.A.", "marzo", "7", "-", "@a.com", "\n"]
+
+    def check_random_edits(self, matcher, nr_edits=300, seed=3):
+        rand = random.Random(seed)
+        session = IncrementalSession(matcher, self.TEXT * 3)
+        for i in range(nr_edits):
+            offset = rand.randrange(len(session.text) + 1)
+            deleted = min(rand.randrange(6), len(session.text) - offset)
+            spans = session.edit(offset, deleted, rand.choice(self.INSERTIONS))
+            assert spans == [elem.span() for elem in matcher.match(session.text)]
+
+    def test_matchers(self):
+        matchers = [
+            regexes.CIFMatcher(),
+            regexes.DNIMatcher(),
+            regexes.EmailMatcher(),
+            regexes.DateMatcher(),
+            regexes.CompanyExtensionMatcher(),
+            regexes.HashTagMatcher(),
+            regexes.SpanishDemonstrativePronounsMatcher(),
+            regexes.MentionMatcher(),
+        ]
+        for matcher in matchers:
+            self.check_random_edits(matcher)
+
+    def test_edit(self):
+        matcher = regexes.MentionMatcher()
+        session = IncrementalSession(matcher, "Hi @Hans and @Pepe")
+        assert session.edit(4, 0, "x") == [(3, 9), (14, 19)]
+        assert session.text == "Hi @xHans and @Pepe"
+        # Deleting the space glues the first mention to the previous word
+        assert session.edit(2, 1, "") == [(13, 18)]
+
+        # Completing a date far from its start
+        text = "Nos vemos el cuatro de noviembre de 20 para arreglar las cosas"
+        session = IncrementalSession(regexes.DateMatcher(), text)
+        assert session.spans == []
+        assert session.edit(text.index(" para"), 0, "19") == [(13, 40)]
+
+    def test_combined_matcher(self):
+        matcher = regexes.CombinedMatcher([regexes.EmailMatcher(), regexes.MentionMatcher(), regexes.DateMatcher()])
+        self.check_random_edits(matcher, nr_edits=100)
+
+    def test_without_context(self):
+        matcher = regexes.RegexMatcher(regexes.EmailMatcher().matcher_regex)
+        assert matcher.max_context is None
+        self.check_random_edits(matcher, nr_edits=50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from regex import regex
+from regexutils.normalisation import NormalisedText, NormalisedMatcher, normalise_char, PLACEHOLDER
+from regexutils.redaction import Redactor
+from regexutils.regexes import RegexMatcher, SingleWordRegexBuilder, EmailMatcher
+
+
+class TestNormalisedText(unittest.TestCase):
+
+    def test_ascii(self):
+        normalised = NormalisedText("Hola Mundo")
+        assert normalised.text == "hola mundo"
+        assert normalised.original_span(5, 10) == (5, 10)
+
+    def test_same_length(self):
+        normalised = NormalisedText("Begoña SÓLO")
+        assert normalised.text == "begona solo"
+        assert normalised.original_span(7, 11) == (7, 11)
+
+    def test_length_changes(self):
+        text = "Straße ﬁn e\u0301xito"
+        normalised = NormalisedText(text)
+        assert normalised.text == "strasse fin exito"
+
+        start = normalised.text.index("fin")
+        orig_start, orig_end = normalised.original_span(start, start + 3)
+        assert text[orig_start:orig_end] == "ﬁn"
+
+        # Half of the expansion of "ß" maps to the whole character
+        start = normalised.text.index("ss")
+        assert normalised.original_span(start, start + 1) == (4, 5)
+
+        # The combining accent following the "e" is part of the original span
+        start = normalised.text.index("exito")
+        orig_start, orig_end = normalised.original_span(start, start + 5)
+        assert text[orig_start:orig_end] == "e\u0301xito"
+
+        assert normalised.original_index(len(normalised)) == len(text)
+
+    def test_separators(self):
+        # Punctuation and white space stay single separators, and unidecode's padding spaces are dropped
+        assert normalise_char("«") == "«"
+        assert normalise_char("–") == "-"
+        assert normalise_char("\u3000") == " "
+        assert normalise_char("中") == "zhong"
+        # Characters unidecode erases or turns into separators become a placeholder, except combining accents
+        assert normalise_char("😀") == PLACEHOLDER
+        assert normalise_char("½") == PLACEHOLDER
+        assert normalise_char("\u0301") == ""
+
+
+class TestNormalisedMatcher(unittest.TestCase):
+
+    def test(self):
+        builder = SingleWordRegexBuilder()
+        builder.add_list_options_as_regex(["esto", "aquella", "strasse"])
+        matcher = NormalisedMatcher(RegexMatcher(regex.compile(builder.build())))
+
+        text = "¿Ésto? No, AQUÉLLA en la Straße"
+        res = matcher.match(text)
+        assert [elem.group() for elem in res] == ["Ésto", "AQUÉLLA", "Straße"]
+        assert res[0].span() == (1, 5)
+
+        normalised = NormalisedText(text)
+        assert [elem.span() for elem in matcher.match(normalised)] == [elem.span() for elem in res]
+
+        assert matcher.match("中esto 😀esto esto😀 esto½") == []
+        assert [elem.group() for elem in matcher.match("中 esto «Esto»")] == ["esto", "Esto"]
+
+    def test_guillemets(self):
+        text = "Correo: «h.degroote@pangeanic.com»"
+        matcher = NormalisedMatcher(EmailMatcher())
+        assert [elem.group() for elem in matcher.match(text)] == ["h.degroote@pangeanic.com"]
+        assert Redactor({"email": matcher}).redact(text).text == "Correo: «[email]»"
+
+
+if __name__ == '__main__':
+    unittest.main()
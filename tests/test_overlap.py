@@ -0,0 +1,79 @@
+import random
+import unittest
+from unittest import mock
+
+from regexutils import regexes
+from regexutils import overlap
+from regexutils.overlap import collect_spans, resolve_overlaps, LabelledSpan, LONGEST, PRIORITY, NESTED
+
+
+def naive_resolve(spans, key):
+    """Quadratic reference implementation of the greedy resolution"""
+    res = []
+    for span in sorted(spans, key=key):
+        if span[1] > span[0] and all(span[1] <= other[0] or other[1] <= span[0] for other in res):
+            res.append(span)
+    return sorted(res)
+
+
+class TestResolveOverlaps(unittest.TestCase):
+    SPANS = [
+        LabelledSpan(0, 10, "EMAIL"),
+        LabelledSpan(3, 8, "MENTION"),
+        LabelledSpan(8, 14, "DATE"),
+        LabelledSpan(12, 20, "DATE"),
+        LabelledSpan(15, 17, "COMPANY"),
+        LabelledSpan(21, 21, "EMPTY"),
+    ]
+
+    def test_longest(self):
+        res = resolve_overlaps(self.SPANS, LONGEST)
+        assert res == [(0, 10, "EMAIL"), (12, 20, "DATE")]
+
+    def test_priority(self):
+        res = resolve_overlaps(self.SPANS, PRIORITY, priorities=["MENTION", "COMPANY"])
+        assert res == [(3, 8, "MENTION"), (8, 14, "DATE"), (15, 17, "COMPANY")]
+
+    def test_nested(self):
+        res = resolve_overlaps(self.SPANS, NESTED)
+        assert res == [(0, 10, "EMAIL"), (3, 8, "MENTION"), (12, 20, "DATE"), (15, 17, "COMPANY")]
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            resolve_overlaps(self.SPANS, "shortest")
+
+    def test_random(self):
+        rand = random.Random(5)
+        spans = []
+        for i in range(500):
+            start = rand.randrange(1000)
+            spans.append(LabelledSpan(start, start + rand.randrange(1, 30), rand.choice("ABC")))
+        ranks = {"B": 0, "C": 1, "A": 2}
+        assert resolve_overlaps(spans, LONGEST) == naive_resolve(spans, lambda s: (s[0] - s[1], s[0]))
+        assert resolve_overlaps(spans, PRIORITY, priorities=["B", "C"]) == \
+            naive_resolve(spans, lambda s: (ranks[s[2]], s[0] - s[1], s[0]))
+
+    def test_random_small_blocks(self):
+        # Small blocks, so that the kept spans are spread over many blocks
+        with mock.patch.object(overlap._DisjointIntervals, "_MAX_BLOCK_SIZE", 4):
+            self.test_random()
+
+    def test_large_offsets(self):
+        spans = [LabelledSpan(10 ** 12, 10 ** 12 + 5, "A"), LabelledSpan(10 ** 12 + 3, 10 ** 12 + 9, "B"),
+                 LabelledSpan(0, 2, "C")]
+        assert resolve_overlaps(spans) == [(0, 2, "C"), (10 ** 12 + 3, 10 ** 12 + 9, "B")]
+
+
+class TestCollectSpans(unittest.TestCase):
+
+    def test(self):
+        text = "Pangea S.A. escribe a h.degroote@pangeanic.com y a @Hañz_í"
+        matchers = {"EMAIL": regexes.EmailMatcher(), "MENTION": regexes.MentionMatcher(),
+                    "COMPANY": regexes.CompanyExtensionMatcher()}
+        spans = collect_spans(text, matchers, extra_spans=[(0, 6, "ORG")])
+        res = resolve_overlaps(spans)
+        assert [text[span.start:span.end] for span in res] == ["Pangea", "S.A.", "h.degroote@pangeanic.com", "@Hañz_í"]
+
+
+if __name__ == '__main__':
+    unittest.main()
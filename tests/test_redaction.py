@@ -0,0 +1,46 @@
+import io
+import unittest
+
+from regexutils import regexes
+from regexutils.redaction import Redactor, MaskPolicy, PlaceholderPolicy, PseudonymPolicy
+
+
+class TestRedactor(unittest.TestCase):
+
+    def test_policies(self):
+        text = "Escribe a h.degroote@pangeanic.com o a @Hañz_í, DNI 50.083.695-E. Otra vez: @Hañz_í y @Pepe"
+        redactor = Redactor(
+            {"EMAIL": regexes.EmailMatcher(), "MENTION": regexes.MentionMatcher(), "DNI": regexes.DNIMatcher()},
+            policies={"DNI": MaskPolicy(), "MENTION": PseudonymPolicy()}
+        )
+        res = redactor.redact(text)
+        assert res.text == "Escribe a [EMAIL] o a MENTION_1, DNI ************. Otra vez: MENTION_1 y MENTION_2"
+        assert [span.label for span in res.spans] == ["EMAIL", "MENTION", "DNI", "MENTION", "MENTION"]
+        for span in res.spans:
+            assert res.text[span.start:span.end] != text[span.original_start:span.original_end]
+
+        # Indexes outside replaced parts are mapped exactly, inside replaced parts to the start of the replacement
+        assert res.redacted_index(3) == 3
+        assert res.redacted_index(text.index(" o a")) == res.text.index(" o a")
+        assert res.redacted_index(text.index("pangeanic")) == res.text.index("[EMAIL]")
+        assert res.redacted_index(len(text)) == len(res.text)
+
+    def test_overlap_and_extra_spans(self):
+        text = "Jose Aguilar escribe a h.degroote@pangeanic.com"
+        redactor = Redactor({"EMAIL": regexes.EmailMatcher(), "MENTION": regexes.MentionMatcher()},
+                            default_policy=PlaceholderPolicy("<{label}>"))
+        res = redactor.redact(text, extra_spans=[(0, 12, "PER")])
+        assert res.text == "<PER> escribe a <EMAIL>"
+
+    def test_stream(self):
+        text = "Hi #PaNíwrevña_2! And welcome"
+        redactor = Redactor({"HASHTAG": regexes.HashTagMatcher()})
+        out = io.StringIO()
+        res = redactor.redact(text, out=out)
+        assert res.text is None
+        assert out.getvalue() == "Hi [HASHTAG]! And welcome"
+        assert len(res.spans) == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
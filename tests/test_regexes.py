@@ -1,3 +1,4 @@
+import datetime
 import unittest
 
 from regexutils import regexes
@@ -55,6 +56,44 @@ class TestMultiWordRegexBuilder(unittest.TestCase):
             self.fail("ValueError thrown in TestMultiWordRegexBuilder which should not happen")
 
 
+class TestCaptureFreeBuild(unittest.TestCase):
+    def test_single_word(self):
+        rb = SingleWordRegexBuilder(capturing=False)
+        rb.add_list_options_as_regex(["and", "or"])
+        rb.add_option(r"\d+", name="number")
+        pattern = regex.compile(rb.build())
+        assert pattern.groups == 1
+        res = RegexMatcher(pattern).match("this and 42, or not")
+        assert [elem.group() for elem in res] == ["and", "42", "or"]
+        assert res[1].group("number") == "42"
+
+        capturing_rb = SingleWordRegexBuilder()
+        capturing_rb.add_list_options_as_regex(["and", "or"])
+        capturing_rb.add_option(r"\d+")
+        capturing_pattern = regex.compile(capturing_rb.build())
+        assert capturing_pattern.groups > 1
+        assert [elem.span() for elem in capturing_pattern.finditer("this and 42, or not")] == \
+            [elem.span() for elem in res]
+
+    def test_multi_word(self):
+        rb = regexes.MultiWordRegexBuilder(capturing=False)
+        rb.add_regex_word("Hello", name="greeting")
+        rb.add_regex_word("once", optional=True)
+        rb.add_regex_word("(?:again|more)", name="what")
+        pattern = regex.compile(rb.build())
+        assert pattern.groups == 2
+        res = RegexMatcher(pattern).match("Hello once again! Hello, more")
+        assert [elem.group() for elem in res] == ["Hello once again", "Hello, more"]
+        assert res[0].group("what") == "again"
+        assert res[1].group("greeting") == "Hello"
+
+    def test_matchers(self):
+        # Only the named groups of the day, month and year
+        assert DateMatcher().matcher_regex.groups == 3
+        assert regexes.HashTagMatcher().first("Hi #PaNíwrevña_2!").group("tag") == "PaNíwrevña_2"
+        assert regexes.MentionMatcher().first("Hi @Hañz_í...").group("user") == "Hañz_í"
+
+
 class TestDateMatcher(unittest.TestCase):
 
     @classmethod
@@ -110,6 +149,45 @@ class TestDateMatcher(unittest.TestCase):
         match = self.matcher.match(ex)[0].captures()[0]  # Potentially stupid code, found very ad hoc
         assert match == "4 de noviembre de 2018"
 
+    def test_lookup_tables(self):
+        assert len(self.matcher.day_values) == 31
+        assert self.matcher.day_values["treinta y uno"] == 31
+        assert self.matcher.day_values["veintiséis"] == 26
+        assert len(self.matcher.month_values) == 12
+        assert self.matcher.month_values["enero"] == 1
+        assert self.matcher.month_values["diciembre"] == 12
+
+    def test_parse(self):
+        text = "Firmado el veintiuno de marzo de 2019 y el 4  DE noViemBre de 2019. El TREINTA Y UNO de diciembre " \
+               "1999, pero no el 31 de febrero de 2019 ni el treinta de Febrero de 2000"
+        res = self.matcher.parse(text)
+        assert res == [((11, 37), datetime.date(2019, 3, 21)), ((43, 66), datetime.date(2019, 11, 4)),
+                       ((71, 102), datetime.date(1999, 12, 31))]
+        assert text[11:37] == "veintiuno de marzo de 2019"
+        match = self.matcher.first(text)
+        assert match.group("day", "month", "year") == ("veintiuno", "marzo", "2019")
+        assert self.matcher.to_date(match) == datetime.date(2019, 3, 21)
+        assert self.matcher.to_date(self.matcher.match(text)[3]) is None
+        # The same with the re module
+        assert DateMatcher(backend="re").parse(text) == res
+
+    def test_parse_case_folding(self):
+        # Characters which the regex engines match case-insensitively, but which str.casefold folds differently
+        examples = [("4 de dİciembre de 2019", datetime.date(2019, 12, 4)),
+                    ("cınco de julio de 2019", datetime.date(2019, 7, 5)),
+                    ("4 de dıciembre de 2019", datetime.date(2019, 12, 4)),
+                    ("VEİNTİUNO de MARZO de 2019", datetime.date(2019, 3, 21))]
+        for backend in ["regex", "re"]:
+            matcher = DateMatcher(backend=backend)
+            for text, date in examples:
+                for elem in matcher.match(text):
+                    assert matcher.to_date(elem) == date
+                assert [date for span, date in matcher.parse(text)] == [date] * len(matcher.match(text))
+        assert DateMatcher().parse("4 de dİciembre de 2019") == [((0, 22), datetime.date(2019, 12, 4))]
+        # The re backend matches the same dates as the regex module
+        for text, date in examples:
+            assert DateMatcher(backend="re").parse(text) == DateMatcher().parse(text)
+
 
 class TestCIFMatcher(unittest.TestCase):
     def test_find_CIFs(self):
@@ -228,5 +306,39 @@ class TestMentionMatcher(unittest.TestCase):
 
 
 
+class TestMatcherQueries(unittest.TestCase):
+    TEXTS = [
+        "Hi #uno and #dos and #tres",
+        "No hashtags here",
+        "#solo",
+        "",
+    ]
+
+    def test(self):
+        matcher = regexes.HashTagMatcher()
+        for text in self.TEXTS:
+            matches = matcher.match(text)
+            assert matcher.contains(text) == (len(matches) > 0)
+            assert matcher.count(text) == len(matches)
+            first = matcher.first(text)
+            assert (first.span() if first is not None else None) == (matches[0].span() if matches else None)
+        assert list(matcher.contains_batch(self.TEXTS)) == [1, 0, 1, 0]
+        assert list(matcher.count_batch(self.TEXTS)) == [3, 0, 1, 0]
+
+
+class TestCombinedMatcher(unittest.TestCase):
+    def test(self):
+        matcher = regexes.CombinedMatcher([regexes.EmailMatcher(), regexes.MentionMatcher(), regexes.DNIMatcher()])
+        text = "@Hans escribe a h.degroote@pangeanic.com con DNI 50083695E y a @Pepe"
+        res = matcher.match(text)
+        assert [elem.group() for elem in res] == ["@Hans", "h.degroote@pangeanic.com", "50083695E", "@Pepe"]
+        assert matcher.contains(text)
+        assert matcher.count(text) == 4
+        assert matcher.first(text).group() == "@Hans"
+        assert matcher.first("nada") is None
+        assert list(matcher.contains_batch([text, "nada", "50083695E"])) == [1, 0, 1]
+        assert list(matcher.count_batch([text, "nada", "50083695E"])) == [4, 0, 1]
+
+
 if __name__ == '__main__':
     unittest.main()
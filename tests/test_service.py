@@ -0,0 +1,107 @@
+import asyncio
+import json
+import unittest
+
+from regexutils import regexes
+from regexutils.service import MatchingService, ServiceOverloaded, RequestTooLarge, start_server
+
+
+MATCHERS = {"email": regexes.EmailMatcher, "mention": regexes.MentionMatcher, "date": regexes.DateMatcher}
+class FailingMatcher:
+    def match(self, text):
+        raise RuntimeError("Matcher failure")
+
+
+TEXT = "Escribe a h.degroote@pangeanic.com o a @Hans antes del 4 de noviembre de 2019"
+
+
+async def post(port, path, body):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = body.encode("utf-8")
+    writer.write("POST {} HTTP/1.1\r\nContent-Length: {}\r\nConnection: close\r\n\r\n".format(
+        path, len(data)).encode("latin-1") + data)
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body.decode("utf-8"))
+
+
+class TestMatchingService(unittest.TestCase):
+
+    def test_amatch(self):
+        async def run():
+            async with MatchingService(MATCHERS, max_workers=2, max_text_length=1000, batch_max_length=100) as service:
+                results = await asyncio.gather(*[service.amatch(name, TEXT) for name in ["email", "mention", "date"]])
+                assert [list(res) for res in results] == [[(10, 34)], [(39, 44)], [(55, 77)]]
+                # Large requests are not batched
+                res = await service.amatch("email", TEXT * 10)
+                assert len(res) == 10
+                with self.assertRaises(RequestTooLarge):
+                    await service.amatch("email", TEXT * 100)
+                with self.assertRaises(KeyError):
+                    await service.amatch("cif", TEXT)
+                assert service.queue_depth == 0
+        asyncio.run(run())
+
+    def test_overloaded(self):
+        async def run():
+            async with MatchingService(MATCHERS, max_pending=4, batch_delay=0.05) as service:
+                tasks = [asyncio.ensure_future(service.amatch("email", TEXT)) for i in range(4)]
+                await asyncio.sleep(0)
+                assert service.queue_depth == 4
+                with self.assertRaises(ServiceOverloaded):
+                    await service.amatch("email", TEXT)
+                assert len(await asyncio.gather(*tasks)) == 4
+        asyncio.run(run())
+
+    def test_close(self):
+        async def run():
+            service = MatchingService(MATCHERS, batch_delay=10)
+            task = asyncio.ensure_future(service.amatch("email", TEXT))
+            await asyncio.sleep(0)
+            # The waiting batch is dispatched before the pool shuts down
+            await service.aclose()
+            assert await task == [(10, 34)]
+            # Requests to a closed service fail instead of waiting forever
+            service.batch_delay = 0.001
+            with self.assertRaises(RuntimeError):
+                await asyncio.wait_for(service.amatch("email", TEXT), 5)
+        asyncio.run(run())
+
+    def test_processes(self):
+        async def run():
+            async with MatchingService(MATCHERS, max_workers=2, use_processes=True) as service:
+                assert await service.amatch("mention", TEXT) == [(39, 44)]
+        asyncio.run(run())
+
+    def test_server(self):
+        async def run():
+            async with MatchingService(MATCHERS, max_text_length=1000) as service:
+                server = await start_server(service)
+                port = server.sockets[0].getsockname()[1]
+                assert await post(port, "/match/email", TEXT) == (200, {"matches": [[10, 34]]})
+                assert (await post(port, "/match/cif", TEXT))[0] == 404
+                assert (await post(port, "/match/email", TEXT * 100))[0] == 413
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"POST /match/email HTTP/1.1\r\nContent-Length: -5\r\n\r\n")
+                assert (await reader.read()).startswith(b"HTTP/1.1 400 ")
+                writer.close()
+                # Lines longer than the limit of the stream reader
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(b"POST /match/email HTTP/1.1\r\nX-Long: " + b"a" * 100000 + b"\r\n\r\n")
+                assert (await reader.read()).startswith(b"HTTP/1.1 400 ")
+                writer.close()
+                server.close()
+                await server.wait_closed()
+
+            async with MatchingService({"failing": FailingMatcher}) as service:
+                server = await start_server(service)
+                port = server.sockets[0].getsockname()[1]
+                assert await post(port, "/match/failing", TEXT) == (500, {"error": "Internal error: RuntimeError"})
+                server.close()
+                await server.wait_closed()
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()